@@ -0,0 +1,59 @@
+'''
+Compares the memory held by each wordlist storage, once loaded and once a
+few queries have built the indexes they need.
+
+Both timings are taken while memory is traced, which slows them down.
+
+Run with wordplay installed, or from the repository root:
+
+    PYTHONPATH=. python benchmarks/memory.py
+'''
+
+from __future__ import print_function
+import gc
+import time
+import tracemalloc
+from wordplay.criteria import Criteria
+from wordplay.dictionary import Dictionary, Storage
+
+
+def measure(storage, word_list):
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    dictionary = Dictionary(word_list, storage=storage)
+    # Bundled wordlists load lazily; load them while memory is traced
+    dictionary.get_wordlist()
+    elapsed = time.time() - start
+    loaded, _ = tracemalloc.get_traced_memory()
+
+    start = time.time()
+    dictionary.get_anagrams('aekst')
+    dictionary.get_words_with_any_letters('retains')
+    dictionary.get_words(Criteria().begins_with('corr').ends_with('s'))
+    dictionary.get_words_within('wordplay')
+    queried = time.time() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return loaded, held, elapsed, queried
+
+
+def main():
+    print('%-10s %-8s %10s %10s %10s %10s' % (
+        'wordlist', 'storage', 'load MiB', 'query MiB', 'load s', 'query s'))
+
+    for word_list in [None, 'Scrabble']:
+        for storage in Storage:
+            loaded, held, elapsed, queried = measure(storage, word_list)
+            print('%-10s %-8s %10.1f %10.1f %10.3f %10.3f' % (
+                word_list or 'sample',
+                storage.name.lower(),
+                loaded / 2.0 ** 20,
+                held / 2.0 ** 20,
+                elapsed,
+                queried))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+'''
+Measures the startup cost of short-lived processes using wordplay.
+
+Each snippet runs in a fresh interpreter several times and the best wall
+time is kept. Run with wordplay installed, or from the repository root:
+
+    PYTHONPATH=. python benchmarks/startup.py
+'''
+
+from __future__ import print_function
+import subprocess
+import sys
+import time
+
+RUNS = 5
+
+SNIPPETS = [
+    ('interpreter', 'pass'),
+    ('import', 'import wordplay.dictionary'),
+    ('construct', 'from wordplay.dictionary import Dictionary; Dictionary()'),
+    ('first query (set)', (
+        'from wordplay.dictionary import Dictionary; '
+        'Dictionary().get_anagrams("stop")')),
+    ('first query (mapped)', (
+        'from wordplay.dictionary import Dictionary, Storage; '
+        'Dictionary(storage=Storage.MAPPED).get_anagrams("stop")')),
+]
+
+
+def measure(code):
+    best = None
+    for _ in range(RUNS):
+        start = time.time()
+        subprocess.check_call([sys.executable, '-c', code])
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    print('%-22s %10s' % ('step', 'ms'))
+
+    for name, code in SNIPPETS:
+        print('%-22s %10.1f' % (name, measure(code) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -14,12 +14,13 @@ setup(
     url='https://github.com/enioluwa23/wordplay',
     packages=['wordplay'],
     package_dir={'wordplay': 'wordplay'},
-    package_data={'wordplay': ['data/*.dat']},
+    package_data={'wordplay': ['data/*.dat', 'data/*.idx']},
     setup_requires=[],
     install_requires=['enum34'],
     extras_require={
         'dev': ['check-manifest'],
         'test': ['pytest', 'tox'],
+        'numpy': ['numpy'],
     },
     project_urls={
         'Documentation': 'https://enioluwa23.github.io/wordplay/',
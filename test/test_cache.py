@@ -0,0 +1,36 @@
+from wordplay.cache import LRUCache
+
+
+def test_get_put():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert tuple(cache.get_info()) == (3, 1, 1, 2, 2)
+
+
+def test_set_maxsize():
+    cache = LRUCache(3)
+    for i in range(3):
+        cache.put(i, i)
+
+    cache.set_maxsize(1)
+    assert len(cache) == 1
+    assert cache.get(2) == 2
+    assert cache.get_info().evictions == 2
+
+    cache.set_maxsize(0)
+    cache.put('a', 1)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    assert cache.get_info().evictions == 3
+
+    cache = LRUCache(0)
+    cache.put('a', 1)
+    assert cache.get_info().evictions == 0
@@ -163,3 +163,79 @@ def test_remove_size():
     words1 = Criteria().size_is(8)
     words1.remove_size()
     assert words1.get_size() is None
+
+
+def test_compile():
+    words1 = Criteria().begins_with('c').ends_with('s').contains('or', 'o')
+    words1.contains_at(('o', 2), ('s', 10)).size_is(10)
+    compiled = words1.compile()
+    words1.remove_size()
+
+    assert compiled.get_size() == 10
+    assert compiled.get_contains() == ['o', 'or']
+    assert compiled.get_contains_at() == {2: 'o', 10: 's'}
+    assert compiled.matches('corrosives')
+    assert not compiled.matches('corrosive')
+    assert not compiled.matches('cartwheels')
+
+    words2 = Criteria().contains('ss', 'ss').compile()
+    assert words2.matches('assesses')
+    assert not words2.matches('sss')
+    assert words2.get_matcher(['size_is'])('sss')
+
+
+def test_freeze():
+    words1 = Criteria().contains('or', 'a').contains_at(('r', 4), ('o', 2))
+    words2 = Criteria().contains_at(('o', 2)).contains('a', 'or')
+    words2.contains_at(('r', 4))
+
+    frozen = words1.freeze()
+    assert frozen == words2.freeze()
+    assert frozen == words2.compile()
+    assert hash(frozen) == hash(words2.compile())
+    assert len({frozen, words2.freeze(), words1.size_is(3).freeze()}) == 2
+    assert frozen.get_contains() == ['a', 'or']
+
+    thawed = frozen.thaw()
+    assert thawed.get_contains_at() == {2: 'o', 4: 'r'}
+    assert thawed.freeze() == frozen
+
+
+def test_serialize():
+    from wordplay.criteria import CompiledCriteria, FrozenCriteria
+    import pickle
+
+    words1 = Criteria().begins_with('c').ends_with('s').contains('or')
+    words1.contains_at(('o', 2), ('r', 4)).size_is(10)
+    frozen = words1.freeze()
+
+    assert frozen.to_dict() == {
+        'size_is': 10,
+        'begins_with': 'c',
+        'ends_with': 's',
+        'contains': ['or'],
+        'contains_at': [[2, 'o'], [4, 'r']],
+    }
+    assert frozen.encode() == '[10,"c","s",["or"],[[2,"o"],[4,"r"]]]'
+    assert FrozenCriteria.from_dict(frozen.to_dict()) == frozen
+    assert FrozenCriteria.decode(frozen.encode()) == frozen
+    assert FrozenCriteria.decode(Criteria().freeze().encode()) == Criteria().freeze()
+
+    compiled = CompiledCriteria.decode(frozen.encode())
+    assert compiled.matches('corrosives')
+
+    unpickled = pickle.loads(pickle.dumps(compiled))
+    assert isinstance(unpickled, CompiledCriteria)
+    assert unpickled == compiled
+
+    try:
+        FrozenCriteria.from_dict({'size_is': 'a'})
+        assert False
+    except ArgumentError:
+        assert True
+
+    try:
+        FrozenCriteria.decode('[1,2]')
+        assert False
+    except ArgumentError:
+        assert True
@@ -0,0 +1,81 @@
+from collections import Counter as Ct
+from wordplay.criteria import Criteria
+from wordplay.dawg import Dawg
+
+word_list = {'a', 'an', 'ant', 'tan', 'nat', 'ante', 'antes', 'tans', 'nats'}
+
+
+def test_dawg():
+    dawg = Dawg(list(word_list) + ['ant'])
+
+    assert len(dawg) == len(word_list)
+    assert list(dawg) == sorted(word_list)
+    assert 'antes' in dawg and 'ants' not in dawg and '' not in dawg
+
+    # 'tans' and 'nats' share the node after their first letter's subtree
+    assert dawg.get_node_count() < sum(len(w) for w in word_list)
+
+
+def test_empty_dawg():
+    dawg = Dawg([])
+
+    assert len(dawg) == 0 and list(dawg) == []
+    assert list(dawg.get_rack_words('abc')) == []
+
+
+def test_get_words():
+    dawg = Dawg(word_list)
+
+    def get_words(criteria):
+        return dawg.get_words(criteria.compile())
+
+    assert get_words(Criteria().begins_with('an')) == ['an', 'ant', 'ante', 'antes']
+    assert get_words(Criteria().size_is(3)) == ['ant', 'nat', 'tan']
+    assert get_words(Criteria().ends_with('s')) == ['antes', 'nats', 'tans']
+    assert get_words(Criteria().contains('at')) == ['nat', 'nats']
+    exp_result = ['ant', 'ante', 'antes', 'nat', 'nats']
+    assert get_words(Criteria().contains_at(('t', 3))) == exp_result
+    assert get_words(Criteria().begins_with('a').contains_at(('t', 1))) == []
+    assert get_words(Criteria().contains_at(('s', 5))) == ['antes']
+
+
+def test_get_words_many():
+    dawg = Dawg(word_list)
+    criterias = [
+        Criteria().begins_with('an'),
+        Criteria().begins_with('an').ends_with('s'),
+        Criteria().begins_with('an').contains('te'),
+        Criteria().size_is(4).contains_at(('a', 2)),
+        Criteria().begins_with('an'),
+    ]
+    criterias = [c.compile() for c in criterias]
+
+    exp_result = [dawg.get_words(c) for c in criterias]
+    assert dawg.get_words_many(criterias) == exp_result
+
+
+def test_get_rack_words():
+    dawg = Dawg(word_list | {'Tna'})
+    exp_result = ['a', 'an', 'ant', 'tan', 'nat', 'tna', 'ante']
+
+    assert Ct(dawg.get_rack_words('tnaex')) == Ct(exp_result)
+    assert Ct(dawg.get_rack_words('tnaex', 3)) == Ct(['ant', 'tan', 'nat', 'tna'])
+    assert Ct(dawg.get_anagrams('tan')) == Ct(['ant', 'tan', 'nat', 'tna'])
+    assert list(dawg.get_rack_words('xyz')) == []
+
+
+def test_get_blank_rack_words():
+    dawg = Dawg(word_list)
+    exp_result = [('ant', ''), ('ante', 'e'), ('antes', 'es')]
+
+    assert sorted(dawg.get_blank_rack_words('tna', 2, None))[2:5] == exp_result
+    assert Ct(dawg.get_blank_rack_words('st', 2, 4)) == Ct(
+        [('tans', 'an'), ('nats', 'an')])
+
+
+def test_get_words_within():
+    dawg = Dawg(word_list)
+
+    assert list(dawg.get_words_within('xantesx')) == ['a', 'an', 'ant', 'ante', 'antes']
+    assert list(dawg.get_words_within('tanant', 3)) == ['tan', 'ant']
+    assert list(dawg.get_words_within('xyz')) == []
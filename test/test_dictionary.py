@@ -1,7 +1,9 @@
+import gzip
+import pytest
 from collections import Counter as Ct
 from wordplay.criteria import Criteria
-from wordplay.dictionary import Dictionary
-from wordplay.utils import Utils
+from wordplay.dictionary import Dictionary, SortOrder, SortType, Storage
+from wordplay.utils import Utils, ArgumentError
 
 global_dict = Dictionary()
 scrabble_dict = Dictionary('Scrabble')
@@ -63,3 +65,375 @@ def test_get_anagrams():
     test_result = global_dict.get_anagrams('aekst')
 
     assert Ct(test_result) == Ct(exp_result)
+
+
+def test_get_words_begins_with():
+    words = Criteria().begins_with('corrug')
+    exp_result = [w for w in global_dict if w.startswith('corrug')]
+    test_result = global_dict.get_words(words)
+
+    assert Ct(test_result) == Ct(exp_result)
+
+    words.size_is(9)
+    test_result = global_dict.get_words(words)
+
+    assert Ct(test_result) == Ct([w for w in exp_result if len(w) == 9])
+
+
+def test_get_words_ends_with():
+    words = Criteria().ends_with('ation')
+    exp_result = [w for w in global_dict if w.endswith('ation')]
+    test_result = global_dict.get_words(words)
+
+    assert Ct(test_result) == Ct(exp_result)
+
+    words.begins_with('co')
+    test_result = global_dict.get_words(words)
+
+    assert Ct(test_result) == Ct([w for w in exp_result if w[:2] == 'co'])
+
+
+def test_wildcard():
+    exp_result = [('post', ''), ('pots', ''), ('spot', ''), ('stop', ''),
+                  ('tops', '')]
+    test_result = global_dict.get_anagrams('opts', wildcard='?')
+
+    assert test_result == exp_result
+
+    test_result = scrabble_dict.get_anagrams('q?iz', wildcard='?')
+
+    assert test_result == [('quiz', 'u')]
+
+    test_result = scrabble_dict.get_words_with_any_letters('zq__', wildcard='_')
+
+    assert ('quiz', 'iu') in test_result
+    assert ('za', 'a') in test_result
+    assert all(len(w) <= 4 and len(u) <= 2 for w, u in test_result)
+
+
+def test_get_words_contains_at():
+    words = Criteria().contains_at(('o', 2), ('r', 4), ('s', 10))
+    exp_result = [w for w in global_dict
+                  if w[1:2] == 'o' and w[3:4] == 'r' and w[9:10] == 's']
+    test_result = global_dict.get_words(words)
+
+    assert 'correlates' in test_result
+    assert Ct(test_result) == Ct(exp_result)
+
+
+def test_get_words_contains():
+    words = Criteria().contains('ophth', 'al')
+    exp_result = [w for w in global_dict if 'ophth' in w and 'al' in w]
+    test_result = global_dict.get_words(words)
+
+    assert Ct(test_result) == Ct(exp_result)
+
+    words = Criteria().contains('ss', 'ss')
+    exp_result = [w for w in global_dict if w.count('ss') >= 2]
+    test_result = global_dict.get_words(words)
+
+    assert Ct(test_result) == Ct(exp_result)
+
+
+def test_explain():
+    words = Criteria().begins_with('cor').contains('or').size_is(10)
+    plan = global_dict.explain(words)
+
+    assert plan.access_path == 'begins_with'
+    assert plan.estimated == plan.actual
+    assert plan.residual == ['size_is', 'contains']
+    assert plan.matches == len(global_dict.get_words(words))
+
+
+def test_get_words_many():
+    criterias = [
+        Criteria().contains_at(('o', 2), ('r', 4)).size_is(10),
+        Criteria().ends_with('ation').contains('ic'),
+        Criteria().contains('z', 'q'),
+        Criteria().contains('z', 'q'),
+        Criteria().begins_with('cor').size_is(5).compile(),
+    ]
+
+    results = global_dict.get_words_many(criterias)
+
+    assert len(results) == len(criterias)
+    for criteria, result in zip(criterias, results):
+        assert Ct(result) == Ct(global_dict.get_words(criteria))
+
+
+def test_start_workers():
+    dictionary = Dictionary(set(w for w in global_dict if w[:1] in 'cdp'))
+    criterias = [
+        Criteria().begins_with('c').ends_with('s').contains('or'),
+        Criteria().contains_at(('o', 2)).size_is(4),
+    ]
+    exp_result = [dictionary.get_words(c) for c in criterias]
+    exp_letters = dictionary.get_words_with_any_letters(
+        'diction', sort_order=SortOrder.DESCENDING, sort_type=SortType.SIZE)
+
+    dictionary.start_workers(3)
+    try:
+        for criteria, result in zip(criterias, exp_result):
+            assert Ct(dictionary.get_words(criteria)) == Ct(result)
+
+        test_result = dictionary.get_words_many(criterias)
+        assert [Ct(r) for r in test_result] == [Ct(r) for r in exp_result]
+
+        test_result = dictionary.get_words_with_any_letters(
+            'diction', sort_order=SortOrder.DESCENDING, sort_type=SortType.SIZE)
+        assert test_result == exp_letters
+
+        dictionary.set_wordlist({'pox', 'ox', 'op'})
+        assert dictionary.get_words_with_any_letters('pox') == ['op', 'ox', 'pox']
+
+        dictionary.add_words(['x', 'po', 'p'])
+        dictionary.remove_words(['ox'])
+        test_result = dictionary.get_words_with_any_letters('pox')
+        assert test_result == ['op', 'p', 'po', 'pox', 'x']
+    finally:
+        dictionary.stop_workers()
+
+
+def test_cache():
+    dictionary = Dictionary({'pots', 'post', 'stop', 'tops'}, cache_size=2)
+
+    test_result = dictionary.get_anagrams('opts')
+    test_result.append('corrupted')
+
+    assert dictionary.get_anagrams('opts') == ['post', 'pots', 'stop', 'tops']
+    assert dictionary.get_cache_info().hits == 1
+
+    dictionary.get_words(Criteria().begins_with('p'))
+    dictionary.get_words(Criteria().begins_with('p').compile())
+    dictionary.get_words_within('stops')
+    info = dictionary.get_cache_info()
+
+    assert (info.hits, info.misses, info.evictions) == (2, 3, 1)
+
+    dictionary.set_wordlist({'spot'})
+    assert dictionary.get_cache_info().currsize == 0
+    assert dictionary.get_anagrams('opts') == ['spot']
+
+
+def test_disabled_cache():
+    dictionary = Dictionary({'pots', 'post', 'stop', 'tops'}, cache_size=0)
+    for _ in range(3):
+        assert dictionary.get_anagrams('opts') == ['post', 'pots', 'stop', 'tops']
+
+    info = dictionary.get_cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (0, 3, 0, 0)
+
+
+def test_mapped_storage():
+    dictionary = Dictionary(storage=Storage.MAPPED)
+    criteria = Criteria().begins_with('c').ends_with('s').contains('or')
+
+    assert Ct(dictionary) == Ct(global_dict)
+    assert Ct(dictionary.get_words(criteria)) == Ct(global_dict.get_words(criteria))
+    assert dictionary.get_anagrams('aekst') == global_dict.get_anagrams('aekst')
+    assert dictionary.get_words_within('hole') == global_dict.get_words_within('hole')
+
+    test_result = dictionary.get_words_with_any_letters('diction', 6)
+    assert test_result == global_dict.get_words_with_any_letters('diction', 6)
+
+    test_result = dictionary.get_words_with_any_letters('pox?', wildcard='?')
+    assert test_result == global_dict.get_words_with_any_letters('pox?', wildcard='?')
+
+
+def test_compact_storage():
+    dictionary = Dictionary({'pots', 'post', 'stop', 'tops'}, storage=Storage.COMPACT)
+
+    assert list(dictionary) == ['post', 'pots', 'stop', 'tops']
+    assert 'stop' in dictionary and 'spot' not in dictionary
+    assert dictionary.get_anagrams('opts') == ['post', 'pots', 'stop', 'tops']
+    assert Ct(dictionary.get_words(Criteria().ends_with('s'))) == Ct(['pots', 'tops'])
+    assert dictionary.get_words_within('stops') == ['stop', 'tops']
+
+
+def test_dawg_storage():
+    dictionary = Dictionary({'pots', 'post', 'stop', 'tops', 'op'}, storage=Storage.DAWG)
+    criteria = Criteria().contains_at(('o', 2)).size_is(4)
+
+    assert list(dictionary) == ['op', 'post', 'pots', 'stop', 'tops']
+    assert 'stop' in dictionary and 'sto' not in dictionary
+    assert dictionary.get_words(criteria) == ['post', 'pots', 'tops']
+    assert dictionary.get_words_many([criteria]) == [['post', 'pots', 'tops']]
+    assert dictionary.get_anagrams('opts') == ['post', 'pots', 'stop', 'tops']
+
+    test_result = dictionary.get_words_with_any_letters('pot?', wildcard='?')
+    assert test_result == [
+        ('op', ''), ('post', 's'), ('pots', 's'), ('stop', 's'), ('tops', 's')]
+
+
+def test_iter_words():
+    criteria = Criteria().begins_with('c').ends_with('s').contains('or')
+    exp_result = global_dict.get_words(criteria)
+
+    assert Ct(global_dict.iter_words(criteria)) == Ct(exp_result)
+
+    test_result = list(global_dict.iter_words(criteria, limit=50))
+    assert len(test_result) == 50 and set(test_result) <= set(exp_result)
+    assert list(global_dict.iter_words(criteria, limit=0)) == []
+
+    with pytest.raises(ArgumentError):
+        global_dict.iter_words(criteria, limit=-1)
+
+
+def test_iter_words_with_any_letters():
+    exp_result = global_dict.get_words_with_any_letters('diction')
+    test_result = global_dict.iter_words_with_any_letters('diction')
+
+    assert Ct(test_result) == Ct(exp_result)
+    assert len(list(global_dict.iter_words_with_any_letters('diction', limit=3))) == 3
+
+    exp_result = global_dict.get_words_with_any_letters('pox?', 3, wildcard='?')
+    test_result = global_dict.iter_words_with_any_letters('pox?', 3, wildcard='?')
+
+    assert Ct(test_result) == Ct(exp_result)
+
+
+def test_iter_words_within():
+    exp_result = ['e', 'h', 'ho', 'hol', 'hole', 'l', 'le', 'o', 'ol', 'ole']
+
+    assert Ct(global_dict.iter_words_within('hole')) == Ct(exp_result)
+    assert list(global_dict.iter_words_within('hole', limit=2)) == ['h', 'ho']
+    assert Ct(global_dict.iter_words_within('hole', 3)) == Ct(['hol', 'ole'])
+
+
+def test_iter_anagrams():
+    exp_result = ['opts', 'post', 'pots', 'spot', 'tops']
+
+    assert Ct(global_dict.iter_anagrams('stop')) == Ct(exp_result)
+    assert len(list(global_dict.iter_anagrams('stop', limit=2))) == 2
+
+    exp_result = global_dict.get_anagrams('sto?', wildcard='?')
+    assert Ct(global_dict.iter_anagrams('sto?', wildcard='?')) == Ct(exp_result)
+
+
+def test_top_k():
+    for sort_order in SortOrder:
+        for sort_type in SortType:
+            exp_result = global_dict.get_words_with_any_letters(
+                'diction', sort_order=sort_order, sort_type=sort_type)
+            test_result = global_dict.get_words_with_any_letters(
+                'diction', sort_order=sort_order, sort_type=sort_type, top_k=5, offset=3)
+
+            assert test_result == exp_result[3:8]
+
+    exp_result = global_dict.get_words_within('hole', sort_type=SortType.SIZE)
+    test_result = global_dict.get_words_within('hole', sort_type=SortType.SIZE, top_k=4)
+
+    assert test_result == exp_result[:4]
+
+    exp_result = global_dict.get_anagrams('st?p', wildcard='?')
+    test_result = global_dict.get_anagrams('st?p', wildcard='?', offset=2)
+
+    assert test_result == exp_result[2:]
+    assert global_dict.get_anagrams('stop', top_k=0) == []
+
+    with pytest.raises(ArgumentError):
+        global_dict.get_anagrams('stop', offset=-1)
+
+
+def test_add_and_remove_words():
+    dictionary = Dictionary({'pots', 'post', 'stop'}, storage=Storage.COMPACT)
+    criteria = Criteria().ends_with('s')
+
+    assert dictionary.get_anagrams('opts') == ['post', 'pots', 'stop']
+    assert dictionary.get_words(criteria) == ['pots']
+
+    dictionary.add_words(['tops', 'spot', 'pots'])
+    dictionary.remove_words(['stop', 'nope'])
+
+    assert dictionary.get_wordlist() == {'pots', 'post', 'tops', 'spot'}
+    assert dictionary.get_anagrams('opts') == ['post', 'pots', 'spot', 'tops']
+    assert Ct(dictionary.get_words(criteria)) == Ct(['pots', 'tops'])
+    assert dictionary.get_words_within('stops') == ['tops']
+
+    with pytest.raises(ArgumentError):
+        dictionary.add_words('tops')
+    with pytest.raises(ArgumentError):
+        dictionary.remove_words(['tops', 3])
+
+
+def test_from_file(tmpdir):
+    content = u'Pots post\nstop\n\npots sp-ot\n'
+    plain = tmpdir.join('words.txt')
+    plain.write_text(content, 'utf-8')
+    compressed = str(tmpdir.join('words.gz'))
+    with gzip.open(compressed, 'wb') as f:
+        f.write(content.encode('utf-8'))
+
+    for path in [str(plain), compressed]:
+        dictionary = Dictionary.from_file(path)
+        assert dictionary.get_wordlist() == {'Pots', 'post', 'stop', 'pots', 'sp-ot'}
+        assert all(isinstance(w, str) for w in dictionary)
+
+    Utils.set_disallowed_chars({'-'})
+    dictionary = Dictionary.from_file(
+        compressed, lowercase=True, allowed_only=True, storage=Storage.COMPACT)
+
+    assert list(dictionary) == ['post', 'pots', 'stop']
+
+
+def test_from_iterable():
+    words = (w for w in ['Pots', 'post', 'pots', ''])
+    dictionary = Dictionary.from_iterable(words, lowercase=True, cache_size=0)
+
+    assert dictionary.get_wordlist() == {'pots', 'post'}
+    assert dictionary.get_cache_info().maxsize == 0
+
+    dictionary = Dictionary.from_iterable([u'pots', 'post'])
+    assert dictionary.get_anagrams('opts') == ['post', 'pots']
+
+    with pytest.raises(ArgumentError):
+        Dictionary.from_iterable(['pots', None])
+
+
+def test_shared_wordlist():
+    first = Dictionary('Scrabble')
+    second = Dictionary('Scrabble')
+
+    assert first.get_wordlist() is scrabble_dict.get_wordlist()
+    assert second.get_wordlist() is scrabble_dict.get_wordlist()
+    assert isinstance(first.get_wordlist(), frozenset)
+
+    mapped = Dictionary(storage=Storage.MAPPED)
+    assert mapped.get_wordlist() is not global_dict.get_wordlist()
+
+    first.add_words(['zzzzyx'])
+    second.set_wordlist({'zzzzyx'})
+
+    assert 'zzzzyx' in first.get_wordlist()
+    assert 'zzzzyx' not in scrabble_dict.get_wordlist()
+    assert first.get_wordlist() is not scrabble_dict.get_wordlist()
+    assert first.get_anagrams('yxzzzz') == ['zzzzyx']
+    assert scrabble_dict.get_anagrams('yxzzzz') == []
+    assert second.get_anagrams('opts') == []
+
+
+def test_bundled_wordlist_round_trip():
+    dictionary = Dictionary(scrabble_dict.get_wordlist())
+    assert dictionary.get_anagrams('opts') == scrabble_dict.get_anagrams('opts')
+
+    dictionary = Dictionary({'spot'})
+    dictionary.set_wordlist(global_dict.get_wordlist())
+    assert Ct(dictionary.get_anagrams('opts')) == Ct(global_dict.get_anagrams('opts'))
+
+    dictionary.add_words(['zzzzyx'])
+    assert 'zzzzyx' not in global_dict.get_wordlist()
+    assert dictionary.get_anagrams('yxzzzz') == ['zzzzyx']
+
+
+def test_wordlist_is_kept():
+    words = {'a', 'b', 'ab'}
+    dictionary = Dictionary(words, cache_size=0)
+    assert dictionary.get_words_with_any_letters('abc') == ['a', 'ab', 'b']
+    assert dictionary.get_wordlist() is words
+
+    dictionary.add_words(['ba'])
+    assert 'ba' in words
+    assert dictionary.get_words_with_any_letters('abc') == ['a', 'ab', 'b', 'ba']
+
+    dictionary.remove_words(['a'])
+    assert dictionary.get_wordlist() == {'b', 'ab', 'ba'}
@@ -0,0 +1,114 @@
+from collections import Counter as Ct
+from wordplay.index import WordIndex
+
+word_list = {'a', 'an', 'ant', 'tan', 'nat', 'ante', 'antes'}
+
+
+def test_get_words_of_length():
+    index = WordIndex(word_list)
+
+    assert Ct(index.get_words_of_length(3)) == Ct(['ant', 'tan', 'nat'])
+    assert Ct(index.get_words_of_length(5)) == Ct(['antes'])
+    assert len(index.get_words_of_length(9)) == 0
+
+
+def test_get_words_with_prefix():
+    index = WordIndex(word_list)
+
+    assert index.get_words_with_prefix('an') == ['an', 'ant', 'ante', 'antes']
+    assert index.get_words_with_prefix('ante') == ['ante', 'antes']
+    assert index.get_words_with_prefix('t') == ['tan']
+    assert index.get_words_with_prefix('z') == []
+
+
+def test_get_words_with_suffix():
+    index = WordIndex(word_list)
+
+    assert Ct(index.get_words_with_suffix('an')) == Ct(['an', 'tan'])
+    assert Ct(index.get_words_with_suffix('t')) == Ct(['ant', 'nat'])
+    assert index.get_words_with_suffix('tes') == ['antes']
+    assert index.get_words_with_suffix('q') == []
+
+
+def test_get_anagrams():
+    index = WordIndex(word_list | {'Tna'})
+
+    assert Ct(index.get_anagrams('nta')) == Ct(['ant', 'tan', 'nat', 'tna'])
+    assert index.get_anagrams('seant') == ['antes']
+    assert index.get_anagrams('xyz') == []
+
+
+def test_get_rack_words():
+    index = WordIndex(word_list)
+    exp_result = ['a', 'an', 'ant', 'tan', 'nat', 'ante']
+
+    assert Ct(index.get_rack_words('tnaex')) == Ct(exp_result)
+    assert Ct(index.get_rack_words('tnaex', 3)) == Ct(['ant', 'tan', 'nat'])
+    assert Ct(index.get_rack_words('aa')) == Ct(['a'])
+    assert len(list(index.get_rack_words('xyz'))) == 0
+
+
+def test_get_blank_rack_words():
+    index = WordIndex(word_list)
+    exp_result = [('ant', ''), ('tan', ''), ('nat', ''), ('ante', 'e')]
+
+    assert Ct(index.get_blank_rack_words('tna', 1, 3)) == Ct(exp_result[:3])
+    assert Ct(index.get_blank_rack_words('tan', 1, 4)) == Ct(exp_result[3:])
+    assert Ct(index.get_blank_rack_words('', 2, 2)) == Ct([('an', 'an')])
+
+
+def test_get_words_at_positions():
+    index = WordIndex(word_list)
+
+    assert index.get_position_count(1, 'a') == 5
+    assert Ct(index.get_words_at_positions({2: 'a'})) == Ct(['tan', 'nat'])
+    assert Ct(index.get_words_at_positions({1: 'a', 3: 't'})) == Ct(
+        ['ant', 'ante', 'antes'])
+    assert index.get_words_at_positions({1: 'a', 5: 's'}) == ['antes']
+    assert index.get_words_at_positions({2: 'q'}) == []
+
+
+def test_get_substring_candidates():
+    index = WordIndex(word_list | {'tante'})
+
+    assert index.get_substring_count('nte') == 3
+    assert Ct(index.get_substring_candidates(['nte'])) == Ct(
+        ['ante', 'antes', 'tante'])
+    assert Ct(index.get_substring_candidates(['ta', 'e'])) == Ct(['tante'])
+    assert index.get_substring_candidates(['xq']) == []
+
+
+def test_get_words_within():
+    index = WordIndex(word_list)
+
+    assert list(index.get_words_within('xantesx')) == ['a', 'an', 'ant', 'ante', 'antes']
+    assert list(index.get_words_within('tanant', 3)) == ['tan', 'ant']
+    assert list(index.get_words_within('anan')) == ['a', 'an', 'a', 'an']
+    assert list(index.get_words_within('xyz')) == []
+
+
+def test_add_and_remove_words():
+    words = set(word_list)
+    index = WordIndex(words)
+    index.get_words_of_length(3)
+    index.get_words_with_prefix('a')
+    index.get_words_with_suffix('s')
+    index.get_anagrams('tan')
+    index.get_words_at_positions({1: 'a'})
+    index.get_substring_candidates(['nt'])
+
+    words.update(['ants', 'Stan'])
+    index.add_words(['ants', 'Stan'])
+    words.difference_update(['ant', 'nat'])
+    index.remove_words(['ant', 'nat'])
+
+    assert Ct(index.get_words_of_length(3)) == Ct(['tan'])
+    assert index.get_words_with_prefix('ant') == ['ante', 'antes', 'ants']
+    assert Ct(index.get_words_with_suffix('ts')) == Ct(['ants'])
+    assert Ct(index.get_anagrams('tans')) == Ct(['ants', 'stan'])
+    assert index.get_anagrams('tan') == ['tan']
+    assert Ct(index.get_words_at_positions({1: 'a'})) == Ct(
+        ['a', 'an', 'ante', 'antes', 'ants'])
+    assert Ct(index.get_substring_candidates(['nt'])) == Ct(['ante', 'antes', 'ants'])
+    assert Ct(index.get_rack_words('stan')) == Ct(
+        ['a', 'an', 'tan', 'ants', 'stan'])
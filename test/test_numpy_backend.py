@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from collections import Counter as Ct
+import pytest
+from wordplay.criteria import Criteria
+from wordplay.dictionary import Dictionary, Backend
+from wordplay.utils import Utils
+
+pytest.importorskip('numpy')
+
+word_list = set(w for w in Dictionary() if w[:2] in ('co', 'st', 'po'))
+word_list |= {'Apple', 'ÉCOLE', 'sss'}
+python_dict = Dictionary(word_list)
+numpy_dict = Dictionary(word_list, backend=Backend.NUMPY)
+
+
+def setup_function(function):
+    Utils.set_disallowed_chars(set())
+
+
+def test_get_words():
+    criterias = [
+        Criteria(),
+        Criteria().begins_with('c').ends_with('s').contains('or'),
+        Criteria().contains_at(('o', 2), ('r', 4)).size_is(10),
+        Criteria().contains('ss', 'ss'),
+        Criteria().contains('pp').begins_with('A'),
+        Criteria().ends_with('ation').contains_at(('n', 9)),
+        Criteria().begins_with('q'),
+    ]
+
+    for criteria in criterias:
+        exp_result = python_dict.get_words(criteria)
+        test_result = numpy_dict.get_words(criteria)
+
+        assert Ct(test_result) == Ct(exp_result)
+
+
+def test_get_words_with_any_letters():
+    for rack, length in [('stoop', None), ('ecole', None), ('postcard', 5)]:
+        exp_result = python_dict.get_words_with_any_letters(rack, length)
+        test_result = numpy_dict.get_words_with_any_letters(rack, length)
+
+        assert test_result == exp_result
+
+        rack += '??'
+        exp_result = python_dict.get_words_with_any_letters(
+            rack, length, wildcard='?')
+        test_result = numpy_dict.get_words_with_any_letters(
+            rack, length, wildcard='?')
+
+        assert test_result == exp_result
+
+
+def test_get_anagrams():
+    for word in ['opts', 'ecole', 'rcoen', 'sto?', 'c??']:
+        exp_result = python_dict.get_anagrams(word, wildcard='?')
+        test_result = numpy_dict.get_anagrams(word, wildcard='?')
+
+        assert test_result == exp_result
+
+    assert numpy_dict.get_anagrams('opts') == python_dict.get_anagrams('opts')
+
+
+def test_add_remove_words():
+    # Dictionaries keep the set they are given, so each gets its own
+    python_copy = Dictionary(set(word_list))
+    numpy_copy = Dictionary(set(word_list), backend=Backend.NUMPY)
+    numpy_copy.get_anagrams('opts')
+
+    # New letters, longer words and enough removals to compact. 'ż' is
+    # added before 'ħ', so their codes are out of character order.
+    added = ['stopż', 'Postpostpostpostpostpostpostpostpost', 'zzzzyx', 'ħżop']
+    removed = sorted(w for w in word_list if w.startswith('st'))
+    for dictionary in [python_copy, numpy_copy]:
+        dictionary.add_words(added)
+        dictionary.remove_words(removed + ['zzzzyx'])
+        dictionary.add_words(['zzzzyx', 'stop'])
+
+    for criteria in [Criteria(), Criteria().begins_with('st'), Criteria().size_is(36)]:
+        exp_result = python_copy.get_words(criteria)
+        assert Ct(numpy_copy.get_words(criteria)) == Ct(exp_result)
+
+    for rack in ['stopż', 'yxzzzz', 'ops?', 'op??']:
+        exp_result = python_copy.get_words_with_any_letters(rack, wildcard='?')
+        assert numpy_copy.get_words_with_any_letters(rack, wildcard='?') == exp_result
+        assert numpy_copy.get_anagrams(rack, wildcard='?') == python_copy.get_anagrams(
+            rack, wildcard='?')
+
+
+def test_get_words_many():
+    criterias = [
+        Criteria().begins_with('co').contains('or'),
+        Criteria().begins_with('co').ends_with('s').contains('or'),
+        Criteria().contains('ss', 'ss').size_is(5),
+        Criteria().contains('ss').ends_with('es'),
+        Criteria().contains_at(('q', 1)).contains('ss'),
+        Criteria().begins_with('co').contains('or'),
+    ]
+
+    exp_result = python_dict.get_words_many(criterias)
+    test_result = numpy_dict.get_words_many(criterias)
+
+    assert [Ct(r) for r in test_result] == [Ct(r) for r in exp_result]
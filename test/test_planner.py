@@ -0,0 +1,89 @@
+from collections import Counter as Ct
+from wordplay.criteria import Criteria
+from wordplay.index import WordIndex
+from wordplay.planner import QueryPlanner
+
+word_list = {'a', 'an', 'ant', 'tan', 'nat', 'ante', 'antes', 'tante'}
+
+
+def make_planner(words=word_list):
+    return QueryPlanner(words, WordIndex(words))
+
+
+def test_plan():
+    planner = make_planner()
+
+    plan = planner.plan(Criteria().compile())
+    assert plan.access_path == 'scan'
+    assert plan.estimated == len(word_list)
+
+    plan = planner.plan(Criteria().begins_with('ant').size_is(3).compile())
+    assert plan.access_path == 'begins_with'
+    assert plan.estimates == {'scan': 8, 'size_is': 3, 'begins_with': 3}
+    assert plan.residual == ['size_is']
+
+
+def test_plan_postings():
+    words = set('w{}'.format(i) for i in range(2000)) | word_list
+    planner = make_planner(words)
+
+    plan = planner.plan(Criteria().contains_at(('a', 1)).contains('tes').compile())
+    assert plan.access_path == 'contains'
+    assert plan.estimated == 1
+    assert plan.residual == ['contains', 'contains_at']
+
+    plan = planner.plan(Criteria().contains_at(('a', 1)).compile())
+    assert plan.access_path == 'contains_at'
+    assert plan.residual == []
+
+    plan = planner.plan(Criteria().contains_at(('a', 1)).size_is(5).compile())
+    assert plan.access_path == 'size_is'
+    assert 'contains_at' not in plan.estimates
+
+
+def test_execute():
+    planner = make_planner()
+    criteria = Criteria().begins_with('a').ends_with('e').compile()
+
+    plan = planner.plan(criteria)
+    assert Ct(planner.execute(criteria, plan)) == Ct(['ante'])
+    assert plan.access_path == 'ends_with'
+    assert plan.actual == 2
+    assert plan.matches == 1
+
+
+def test_execute_many():
+    planner = make_planner()
+    criterias = [
+        Criteria().begins_with('a').ends_with('e').compile(),
+        Criteria().contains('n').compile(),
+        Criteria().size_is(3).compile(),
+        Criteria().size_is(3).begins_with('n').compile(),
+        Criteria().contains('n').compile(),
+    ]
+
+    results = planner.execute_many(criterias)
+
+    assert len(results) == 5
+    for criteria, result in zip(criterias, results):
+        assert Ct(result) == Ct(planner.execute(criteria))
+    assert results[1] is not results[4]
+
+
+def test_iterate():
+    planner = make_planner()
+    criteria = Criteria().contains('nt').compile()
+    test_result = planner.iterate(criteria)
+
+    assert next(test_result) in planner.execute(criteria)
+    assert Ct(planner.iterate(criteria)) == Ct(planner.execute(criteria))
+    assert Ct(planner.iterate(criteria, 2)) == Ct(planner.execute(criteria))
+
+
+def test_plan_without_postings():
+    words = set('w{}'.format(i) for i in range(2000)) | word_list
+    criteria = Criteria().contains_at(('a', 1)).contains('tes').compile()
+    plan = make_planner(words).plan(criteria, postings=False)
+
+    assert plan.access_path == 'scan'
+    assert sorted(plan.estimates) == ['scan']
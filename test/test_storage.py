@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import pytest
+from collections import Counter as Ct
+from wordplay.storage import CompactWordList, MappedWordList, build_index, get_data_path
+from wordplay.utils import ArgumentError
+
+# Words are UTF-8 encoded str on Python 2
+ete = u'été' if str is not bytes else u'été'.encode('utf-8')
+word_list = {'a', 'an', 'ant', 'tan', 'nat', 'Tna', 'ante', 'antes', ete}
+
+
+@pytest.fixture
+def mapped(tmpdir):
+    path = str(tmpdir.join('words.idx'))
+    build_index(word_list, path)
+
+    return MappedWordList(path)
+
+
+def test_mapped_word_list(mapped):
+    assert len(mapped) == len(word_list)
+    assert list(mapped) == sorted(word_list)
+    assert mapped[0] == 'Tna' and mapped[-1] == ete
+    assert mapped[1:3] == ['a', 'an']
+
+    assert 'ante' in mapped and ete in mapped
+    assert 'ant ' not in mapped and 'zzz' not in mapped and 3 not in mapped
+
+
+def test_get_words_of_length(mapped):
+    # Python 2 counts the bytes of the UTF-8 str, so lengths are computed
+    for length in [3, 5, 9]:
+        exp_result = sorted(w for w in word_list if len(w) == length)
+        assert mapped.get_words_of_length(length) == exp_result
+
+    assert mapped.get_words_of_length(5)[0] == 'antes'
+
+
+def test_get_words_with_signature(mapped):
+    exp_result = ['ant', 'tan', 'nat', 'tna']
+
+    assert Ct(mapped.get_words_with_signature('ant')) == Ct(exp_result)
+    assert mapped.get_words_with_signature('aenst') == ['antes']
+    assert mapped.get_words_with_signature('xyz') == []
+
+
+def test_compact_word_list():
+    compact = CompactWordList(list(word_list) + ['ant'])
+
+    assert list(compact) == sorted(word_list)
+    assert 'Tna' in compact and 'tna' not in compact
+    assert compact.get_words_of_length(4) == ['ante']
+    exp_result = ['ant', 'tan', 'nat', 'tna']
+    assert Ct(compact.get_words_with_signature('ant')) == Ct(exp_result)
+    assert compact.get_alphabet() == set('antesé')
+
+
+def test_build_index_from_file(tmpdir):
+    source = tmpdir.join('words.dat')
+    source.write('pots\nstop post\npots\n')
+    path = str(tmpdir.join('words.idx'))
+    build_index(str(source), path)
+
+    assert list(MappedWordList(path)) == ['post', 'pots', 'stop']
+
+
+def test_invalid_file(tmpdir):
+    for content in [b'', b'WORDPLAY', b'not an index file at all, really']:
+        path = tmpdir.join('bad.idx')
+        path.write_binary(content)
+
+        with pytest.raises(ArgumentError):
+            MappedWordList(str(path))
+
+
+def test_bundled_indexes():
+    for name in ['sample_wordlist', 'scrabble_wordlist']:
+        with open(get_data_path('%s.dat' % name)) as f:
+            words = set(f.read().split())
+
+        mapped = MappedWordList(get_data_path('%s.idx' % name))
+
+        assert len(mapped) == len(words)
+        assert list(mapped) == sorted(words)
@@ -53,3 +53,15 @@ def test_is_allowed_char():
 
     for i in should_false:
         assert not Utils.is_allowed_char(i)
+
+
+def test_is_allowed_str():
+    Utils.set_disallowed_chars({'1'})
+    should_true = ['a', 'Ab']
+    should_false = ['1', 'a1', 'ab1c']
+
+    for i in should_true:
+        assert Utils.is_allowed_str(i)
+
+    for i in should_false:
+        assert not Utils.is_allowed_str(i)
@@ -0,0 +1,105 @@
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class LRUCache(object):
+    '''
+    Class providing a bounded mapping that evicts the least recently used
+    entry when it is full.
+
+    A maxsize of 0 disables caching: nothing is stored and every lookup is
+    a miss.
+    '''
+
+    def __init__(self, maxsize=128):
+        self.__entries = OrderedDict()
+        self.__maxsize = maxsize
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __evict(self):
+        while len(self.__entries) > self.__maxsize:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def get(self, key):
+        '''
+        Looks a key up, marking it as most recently used.
+
+        Args:
+            key: Hashable key
+
+        Returns:
+            The cached value, or None on a miss
+        '''
+
+        try:
+            value = self.__entries.pop(key)
+        except KeyError:
+            self.__misses += 1
+            return None
+
+        self.__entries[key] = value
+        self.__hits += 1
+
+        return value
+
+    def put(self, key, value):
+        '''
+        Stores a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Hashable key
+            value: Value to store; must not be None
+        '''
+
+        if self.__maxsize == 0:
+            return
+
+        self.__entries.pop(key, None)
+        self.__entries[key] = value
+        self.__evict()
+
+    def clear(self):
+        '''Drop every entry. Statistics are kept.'''
+
+        self.__entries.clear()
+
+    def get_maxsize(self):
+        return self.__maxsize
+
+    def set_maxsize(self, maxsize):
+        '''
+        Changes how many entries the cache holds, evicting if needed.
+
+        Args:
+            maxsize (`int`): New maximum number of entries, 0 to disable
+        '''
+
+        self.__maxsize = maxsize
+        self.__evict()
+
+    def get_info(self):
+        '''
+        Gets the cache statistics.
+
+        Returns:
+            A `CacheInfo` named tuple of hits, misses, evictions, maxsize and
+            currsize
+        '''
+
+        return CacheInfo(
+            self.__hits,
+            self.__misses,
+            self.__evictions,
+            self.__maxsize,
+            len(self.__entries))
+
+
+__all__ = ['LRUCache', 'CacheInfo']
@@ -1,6 +1,24 @@
+import json
+import re
 from .utils import ArgumentError, CriteriaError, ErrorMessage
 from .utils import Utils as Ut
 
+SIZE_IS = 'size_is'
+BEGINS_WITH = 'begins_with'
+ENDS_WITH = 'ends_with'
+CONTAINS = 'contains'
+CONTAINS_AT = 'contains_at'
+
+
+def _to_str(value):
+    # json decodes strings to unicode on Python 2, where words are str
+    if isinstance(value, list):
+        return [_to_str(v) for v in value]
+    elif isinstance(value, type(u'')) and not isinstance(value, str):
+        return value.encode('utf-8')
+
+    return value
+
 
 class Criteria(object):
     '''Class providing an interface for building search parameters.'''
@@ -230,5 +248,340 @@ class Criteria(object):
         '''Remove the size restriction on the word.'''
         self.__word_length = None
 
+    def freeze(self):
+        '''
+        Snapshot the criteria into an immutable, hashable value.
+
+        Returns:
+            A `FrozenCriteria`. Later changes to the criteria do not
+            affect it.
+        '''
+
+        return FrozenCriteria(self)
+
+    def compile(self):
+        '''
+        Snapshot the criteria into an immutable, reusable compiled query.
+
+        Returns:
+            A `CompiledCriteria` that `Dictionary.get_words` accepts in place
+            of the criteria. Later changes to the criteria do not affect it.
+        '''
+
+        return CompiledCriteria(self)
+
+
+class FrozenCriteria(object):
+    '''
+    Class providing an immutable, hashable snapshot of a `Criteria`.
+
+    The constraints are kept in canonical order (contains sorted,
+    contains_at as a tuple of (position, letter) pairs sorted by position),
+    so two snapshots are equal, and hash alike, iff they set the same
+    constraints. Snapshots convert to and from a dict and a compact string,
+    for use as cache keys, in batches and across processes.
+    '''
+
+    def __init__(self, criteria):
+        if not isinstance(criteria, Criteria):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+        contains = [c if isinstance(c, str) else ''.join(c)
+                    for c in criteria.get_contains()]
+        size = criteria.get_size()
+
+        self.__begins_with = criteria.get_begins_with()
+        self.__ends_with = criteria.get_ends_with()
+        self.__contains = tuple(sorted(contains))
+        self.__contains_at = tuple(sorted(criteria.get_contains_at().items()))
+        self.__word_length = size if size != 0 else None
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenCriteria):
+            return NotImplemented
+
+        return self.get_key() == other.get_key()
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self.get_key())
+
+    def __reduce__(self):
+        return _decode_criteria, (self.__class__, self.encode())
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.to_dict())
+
+    def get_begins_with(self):
+        return self.__begins_with
+
+    def get_ends_with(self):
+        return self.__ends_with
+
+    def get_contains(self):
+        return list(self.__contains)
+
+    def get_contains_at(self):
+        return dict(self.__contains_at)
+
+    def get_size(self):
+        return self.__word_length
+
+    def get_key(self):
+        '''
+        Gets a hashable canonical form of the query.
+
+        Returns:
+            A tuple that is equal for two snapshots iff they match the same
+            words
+        '''
+
+        return (
+            self.__word_length,
+            self.__begins_with,
+            self.__ends_with,
+            self.__contains,
+            self.__contains_at)
+
+    def get_constraints(self):
+        '''
+        Gets the names of the constraints this query sets.
+
+        Returns:
+            A list of names among 'size_is', 'begins_with', 'ends_with',
+            'contains' and 'contains_at'
+        '''
+
+        constraints = []
+        if self.__word_length is not None:
+            constraints.append(SIZE_IS)
+        if len(self.__begins_with) != 0:
+            constraints.append(BEGINS_WITH)
+        if len(self.__ends_with) != 0:
+            constraints.append(ENDS_WITH)
+        if len(self.__contains) != 0:
+            constraints.append(CONTAINS)
+        if len(self.__contains_at) != 0:
+            constraints.append(CONTAINS_AT)
+
+        return constraints
+
+    def thaw(self):
+        '''
+        Gets a mutable `Criteria` with the same constraints.
+
+        Returns:
+            A new `Criteria`
+        '''
+
+        criteria = Criteria()
+
+        if self.__word_length is not None:
+            criteria.size_is(self.__word_length)
+        if len(self.__begins_with) != 0:
+            criteria.begins_with(self.__begins_with)
+        if len(self.__ends_with) != 0:
+            criteria.ends_with(self.__ends_with)
+        if len(self.__contains) != 0:
+            criteria.contains(*self.__contains)
+        if len(self.__contains_at) != 0:
+            criteria.contains_at(*((v, k) for k, v in self.__contains_at))
+
+        return criteria
+
+    def to_dict(self):
+        '''
+        Gets the constraints as a dict of plain values.
+
+        Returns:
+            A dict mapping the name of each constraint that is set to its
+            value: an int for size_is, a str for begins_with and ends_with,
+            a sorted list of str for contains and a sorted list of
+            [position, letter] pairs for contains_at
+        '''
+
+        result = {}
+
+        if self.__word_length is not None:
+            result[SIZE_IS] = self.__word_length
+        if len(self.__begins_with) != 0:
+            result[BEGINS_WITH] = self.__begins_with
+        if len(self.__ends_with) != 0:
+            result[ENDS_WITH] = self.__ends_with
+        if len(self.__contains) != 0:
+            result[CONTAINS] = list(self.__contains)
+        if len(self.__contains_at) != 0:
+            result[CONTAINS_AT] = [[k, v] for k, v in self.__contains_at]
+
+        return result
+
+    @classmethod
+    def from_dict(cls, arg):
+        '''
+        Builds a snapshot from the output of to_dict.
+
+        Args:
+            arg (`dict`): Constraints by name
+
+        Returns:
+            A new instance of the class it is called on
+
+        Raises:
+            `ArgumentError`: If arg is not a valid dict of constraints
+        '''
+
+        if not isinstance(arg, dict):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+        criteria = Criteria()
+
+        try:
+            for name, value in arg.items():
+                if name == SIZE_IS:
+                    criteria.size_is(value)
+                elif name == BEGINS_WITH:
+                    criteria.begins_with(value)
+                elif name == ENDS_WITH:
+                    criteria.ends_with(value)
+                elif name == CONTAINS:
+                    criteria.contains(*value)
+                elif name == CONTAINS_AT:
+                    criteria.contains_at(*((v, k) for k, v in value))
+                else:
+                    raise ArgumentError(ErrorMessage.INVALID_CRTRA)
+        except (TypeError, ValueError):
+            raise ArgumentError(ErrorMessage.INVALID_CRTRA)
+
+        return cls(criteria)
+
+    def encode(self):
+        '''
+        Gets a compact string form of the constraints.
+
+        Returns:
+            A JSON array of size, begins_with, ends_with, contains and
+            contains_at, e.g. '[10,"c","s",["or"],[[2,"o"],[4,"r"]]]'
+        '''
+
+        return json.dumps([
+            self.__word_length,
+            self.__begins_with,
+            self.__ends_with,
+            self.__contains,
+            self.__contains_at], separators=(',', ':'), ensure_ascii=False)
+
+    @classmethod
+    def decode(cls, arg):
+        '''
+        Builds a snapshot from the output of encode.
+
+        Args:
+            arg (`str`): Compact string form of the constraints
+
+        Returns:
+            A new instance of the class it is called on
+
+        Raises:
+            `ArgumentError`: If arg is not a valid encoding
+        '''
+
+        try:
+            size, begins, ends, contains, contains_at = _to_str(json.loads(arg))
+        except (TypeError, ValueError):
+            raise ArgumentError(ErrorMessage.INVALID_CRTRA)
+
+        result = {}
+        for name, value in [
+                (SIZE_IS, size),
+                (BEGINS_WITH, begins),
+                (ENDS_WITH, ends),
+                (CONTAINS, contains),
+                (CONTAINS_AT, contains_at)]:
+            if value:
+                result[name] = value
+
+        return cls.from_dict(result)
+
+
+class CompiledCriteria(FrozenCriteria):
+    '''
+    Class providing an immutable, precompiled form of a `Criteria`.
+
+    On top of the canonical snapshot of `FrozenCriteria`, the constraints
+    are turned into a single anchored regex of lookaheads, one per
+    constraint, so matching a word is one C-level call. Regexes covering
+    only some of the constraints, as the query planner needs for residual
+    filtering, are compiled on first use and kept.
+    '''
+
+    def __init__(self, criteria):
+        FrozenCriteria.__init__(self, criteria)
+        self.__patterns = {}
+
+    def __compile(self, constraints):
+        parts = []
+
+        if SIZE_IS in constraints:
+            parts.append(r'(?=.{%d}\Z)' % self.get_size())
+        if BEGINS_WITH in constraints:
+            parts.append('(?=%s)' % re.escape(self.get_begins_with()))
+        if ENDS_WITH in constraints:
+            parts.append(r'(?=.*%s\Z)' % re.escape(self.get_ends_with()))
+        if CONTAINS in constraints:
+            # n non-overlapping matches found left to right, as str.count
+            # counts them
+            contains = self.get_contains()
+            for c in sorted(set(contains)):
+                parts.append('(?=(?:.*?%s){%d})' % (
+                    re.escape(c), contains.count(c)))
+        if CONTAINS_AT in constraints:
+            for k, v in sorted(self.get_contains_at().items()):
+                parts.append('(?=.{%d}%s)' % (k - 1, re.escape(v)))
+
+        return re.compile(''.join(parts), re.DOTALL).match
+
+    def get_matcher(self, constraints=None):
+        '''
+        Gets a predicate checking some or all of the constraints on a word.
+
+        Args:
+            constraints (`list`): Names of the constraints to check, as
+                returned by get_constraints, or None for all of them. Names
+                of constraints the query does not set are ignored
+
+        Returns:
+            A callable taking a word and returning a truthy value iff the
+            word satisfies those constraints
+        '''
+
+        key = frozenset(self.get_constraints())
+        if constraints is not None:
+            key = key.intersection(constraints)
+
+        if key not in self.__patterns:
+            self.__patterns[key] = self.__compile(key)
+
+        return self.__patterns[key]
+
+    def matches(self, word):
+        '''
+        Checks whether a word satisfies every constraint.
+
+        Args:
+            word (`str`): Word to check
+
+        Returns:
+            `True` if the word matches, `False` otherwise
+        '''
+
+        return self.get_matcher()(word) is not None
+
+
+def _decode_criteria(cls, arg):
+    return cls.decode(arg)
+
 
-__all__ = ['Criteria']
+__all__ = ['Criteria', 'FrozenCriteria', 'CompiledCriteria']
@@ -0,0 +1,411 @@
+from array import array
+from .criteria import SIZE_IS, BEGINS_WITH, ENDS_WITH, CONTAINS
+
+
+class _Node(object):
+    __slots__ = ['final', 'edges', 'id']
+
+    def __init__(self):
+        self.final = False
+        self.edges = {}
+        self.id = None
+
+    def get_key(self):
+        edges = tuple(sorted((c, n.id) for c, n in self.edges.items()))
+        return self.final, edges
+
+
+class Dawg(object):
+    '''
+    Class providing a read-only set of words as a minimized directed acyclic
+    word graph.
+
+    Words sharing a prefix share the path spelling it, and words sharing a
+    suffix share the nodes after it, so a large wordlist takes a fraction of
+    the nodes of a trie. The graph is built incrementally from the sorted
+    words, registering each finished node so that equivalent ones are
+    merged, and then frozen into flat arrays: the edges of node i are
+    labels[first[i]:first[i + 1]] leading to the nodes at the same
+    positions of targets.
+
+    Queries are walks from the root that prune every edge the constraints
+    rule out, using the shortest and longest remaining word below each
+    node. Words come out in sorted order. Racks and anagrams are matched in
+    lowercase, like the other backends.
+
+    Args:
+        words (iterable): The str words; duplicates are dropped
+    '''
+
+    def __init__(self, words):
+        root = self.__build(sorted(set(words)))
+        self.__freeze(root)
+
+    def __build(self, words):
+        register = {}
+        root = _Node()
+        # Path of the previous word whose nodes are not registered yet
+        unchecked = []
+        previous = ''
+
+        def minimize(depth):
+            while len(unchecked) > depth:
+                parent, c, child = unchecked.pop()
+                key = child.get_key()
+                if key in register:
+                    parent.edges[c] = register[key]
+                else:
+                    child.id = len(register)
+                    register[key] = child
+
+        for word in words:
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+
+            minimize(common)
+
+            node = root if len(unchecked) == 0 else unchecked[-1][2]
+            for c in word[common:]:
+                child = _Node()
+                node.edges[c] = child
+                unchecked.append((node, c, child))
+                node = child
+
+            node.final = True
+            previous = word
+
+        minimize(0)
+        root.id = len(register)
+
+        self.__count = len(words)
+
+        return root
+
+    def __freeze(self, root):
+        # Registered ids are a post-order: children are numbered before
+        # their parents, and the root last.
+        nodes = [None] * (root.id + 1)
+        stack = [root]
+        while len(stack) != 0:
+            node = stack.pop()
+            if nodes[node.id] is None:
+                nodes[node.id] = node
+                stack.extend(node.edges.values())
+
+        first = array('I', [0])
+        labels = []
+        targets = array('I')
+        final = bytearray(len(nodes))
+        shortest = array('I')
+        longest = array('I')
+
+        for node in nodes:
+            edges = sorted(node.edges.items())
+            labels.extend(c for c, _ in edges)
+            targets.extend(n.id for _, n in edges)
+            first.append(len(targets))
+            final[node.id] = node.final
+
+            rests = [(shortest[n.id] + 1, longest[n.id] + 1) for _, n in edges]
+            if node.final or len(rests) == 0:
+                # Only the root of an empty graph has neither
+                rests.append((0, 0))
+            shortest.append(min(r[0] for r in rests))
+            longest.append(max(r[1] for r in rests))
+
+        self.__root = root.id
+        self.__first = first
+        self.__labels = ''.join(labels)
+        self.__targets = targets
+        self.__final = final
+        self.__shortest = shortest
+        self.__longest = longest
+
+    def __len__(self):
+        return self.__count
+
+    def __iter__(self):
+        return self.__walk(self.__root, '', None, {})
+
+    def __contains__(self, word):
+        if not isinstance(word, str):
+            return False
+
+        node = self.__get_node(self.__root, word)
+        return node is not None and self.__final[node] == 1
+
+    def __get_node(self, node, prefix):
+        for c in prefix:
+            for e in range(self.__first[node], self.__first[node + 1]):
+                if self.__labels[e] == c:
+                    node = self.__targets[e]
+                    break
+            else:
+                return None
+
+        return node
+
+    def __walk(self, node, prefix, size, letters_at):
+        first = self.__first
+        labels = self.__labels
+        targets = self.__targets
+        final = self.__final
+        shortest = self.__shortest
+        longest = self.__longest
+
+        # Words must be long enough to hold the last pinned letter.
+        reach = max([len(prefix)] + list(letters_at))
+
+        # Edges are pushed in reverse so that words come out in order.
+        stack = [(node, prefix)]
+        while len(stack) != 0:
+            node, word = stack.pop()
+            depth = len(word)
+
+            if final[node] == 1 and depth >= reach:
+                if size is None or depth == size:
+                    yield word
+
+            expected = letters_at.get(depth + 1)
+            for e in range(first[node + 1] - 1, first[node] - 1, -1):
+                c = labels[e]
+                child = targets[e]
+                if expected is not None and c != expected:
+                    continue
+                if depth + 1 + longest[child] < reach:
+                    continue
+                if size is not None:
+                    if depth + 1 + shortest[child] > size:
+                        continue
+                    if depth + 1 + longest[child] < size:
+                        continue
+
+                stack.append((child, word + c))
+
+    def __walk_rack(self, counts, blanks, length):
+        first = self.__first
+        labels = self.__labels
+        targets = self.__targets
+        final = self.__final
+        shortest = self.__shortest
+        longest = self.__longest
+        tiles = sum(counts.values()) + blanks
+
+        stack = [(self.__root, '', blanks, '')]
+        while len(stack) != 0:
+            node, word, left, used = stack.pop()
+            depth = len(word)
+
+            if final[node] == 1 and (length is None or depth == length):
+                yield word, ''.join(sorted(used))
+
+            for e in range(first[node + 1] - 1, first[node] - 1, -1):
+                c = labels[e].lower()
+                child = targets[e]
+                if depth + 1 + shortest[child] > tiles:
+                    continue
+                if length is not None:
+                    if depth + 1 + shortest[child] > length:
+                        continue
+                    if depth + 1 + longest[child] < length:
+                        continue
+
+                # A tile from the rack is always spent before a blank, so the
+                # rack has one left while the word holds fewer copies than
+                # it, and the blanks stand for exactly the letters it lacks.
+                if word.count(c) < counts.get(c, 0):
+                    stack.append((child, word + c, left, used))
+                elif left > 0:
+                    stack.append((child, word + c, left - 1, used + c))
+
+    def __get_counts(self, letters):
+        counts = {}
+        for c in letters:
+            counts[c] = counts.get(c, 0) + 1
+
+        return counts
+
+    def __get_walk(self, criteria):
+        # What the walk prunes on; ends_with and contains are left to check
+        # on the words it reaches.
+        constraints = criteria.get_constraints()
+        size = criteria.get_size() if SIZE_IS in constraints else None
+        prefix = criteria.get_begins_with() if BEGINS_WITH in constraints else ''
+        letters_at = tuple(sorted(criteria.get_contains_at().items()))
+
+        return prefix, size, letters_at
+
+    def __iter_walk(self, prefix, size, letters_at):
+        letters_at = dict(letters_at)
+        for k, v in letters_at.items():
+            if k <= len(prefix) and prefix[k - 1] != v:
+                return iter([])
+
+        node = self.__get_node(self.__root, prefix)
+        if node is None:
+            return iter([])
+
+        return self.__walk(node, prefix, size, letters_at)
+
+    def __filter(self, criteria, words):
+        constraints = criteria.get_constraints()
+        residual = [c for c in [ENDS_WITH, CONTAINS] if c in constraints]
+        if len(residual) == 0:
+            return words
+
+        matches = criteria.get_matcher(residual)
+        return (w for w in words if matches(w))
+
+    def iter_words(self, criteria):
+        '''
+        Walks the words matching a compiled query.
+
+        The walk starts at the end of the begins_with path, follows only
+        the expected letter at contains_at positions and skips nodes that
+        cannot complete a word of the requested size. ends_with and
+        contains are checked on the words it reaches.
+
+        Args:
+            criteria (`CompiledCriteria`): Compiled search parameters
+
+        Returns:
+            An iterator over the matching words in sorted order
+        '''
+
+        words = self.__iter_walk(*self.__get_walk(criteria))
+
+        return self.__filter(criteria, words)
+
+    def get_words(self, criteria):
+        '''
+        Gets the words matching a compiled query.
+
+        Args:
+            criteria (`CompiledCriteria`): Compiled search parameters
+
+        Returns:
+            A sorted list of the words matching the criteria
+        '''
+
+        return list(self.iter_words(criteria))
+
+    def get_words_many(self, criterias):
+        '''
+        Gets the words matching each of a batch of compiled queries.
+
+        Queries with the same begins_with, size and contains_at take the
+        same walk, so it is taken once and each of them only checks its
+        ends_with and contains on the words reached. Identical queries are
+        answered once.
+
+        Args:
+            criterias (`list`): `CompiledCriteria` objects
+
+        Returns:
+            A list holding, for each criteria in order, the sorted list of
+            words matching it
+        '''
+
+        walks = {}
+        results = {}
+        for criteria in set(criterias):
+            walk = self.__get_walk(criteria)
+            if walk not in walks:
+                walks[walk] = list(self.__iter_walk(*walk))
+
+            results[criteria] = list(self.__filter(criteria, walks[walk]))
+
+        return [list(results[criteria]) for criteria in criterias]
+
+    def get_words_within(self, text, length=None):
+        '''
+        Gets the words occurring as substrings of a text.
+
+        Walks the graph from the root at each start position and stops as
+        soon as the next character has no edge.
+
+        Args:
+            text (`str`): Text to search
+            length (`int`): Exact length of the words, or None for any
+
+        Returns:
+            A generator over the words in order of start, then length.
+            Words occurring more than once repeat
+        '''
+
+        first = self.__first
+        labels = self.__labels
+        targets = self.__targets
+        final = self.__final
+
+        for i in range(len(text)):
+            node = self.__root
+            end = len(text) if length is None else min(len(text), i + length)
+
+            for j in range(i, end):
+                for e in range(first[node], first[node + 1]):
+                    if labels[e] == text[j]:
+                        node = targets[e]
+                        break
+                else:
+                    break
+
+                if final[node] == 1 and (length is None or j + 1 - i == length):
+                    yield text[i:j + 1]
+
+    def get_rack_words(self, letters, length=None):
+        '''
+        Gets the lowercased words that can be formed from a rack of letters.
+
+        Args:
+            letters (`str`): Rack of letters
+            length (`int`): Exact length of the words, or None for any
+
+        Returns:
+            A generator over the lowercased words
+        '''
+
+        walk = self.__walk_rack(self.__get_counts(letters), 0, length)
+
+        return (w for w, _ in walk)
+
+    def get_blank_rack_words(self, letters, blanks, length=None):
+        '''
+        Gets the words that can be formed from a rack holding blank tiles.
+
+        Args:
+            letters (`str`): Rack of letters, without the blanks
+            blanks (`int`): Number of blank tiles that match any letter
+            length (`int`): Exact length of the words, or None for any
+
+        Returns:
+            A generator over (word, used) tuples, where used holds the
+            letters the blanks stood for in sorted order
+        '''
+
+        return self.__walk_rack(self.__get_counts(letters), blanks, length)
+
+    def get_anagrams(self, letters):
+        '''
+        Gets the lowercased words made of exactly the given letters.
+
+        Args:
+            letters (`str`): Letters the words should be made of
+
+        Returns:
+            A list of the lowercased words
+        '''
+
+        return list(self.get_rack_words(letters, len(letters)))
+
+    def get_node_count(self):
+        return len(self.__final)
+
+    def get_edge_count(self):
+        return len(self.__targets)
+
+
+__all__ = ['Dawg']
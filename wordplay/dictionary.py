@@ -1,6 +1,16 @@
-from pkg_resources import resource_filename as rf
 from enum import Enum
-from .criteria import Criteria
+import gzip
+import heapq
+import io
+import threading
+from itertools import islice
+from operator import itemgetter
+from .cache import LRUCache
+from .criteria import Criteria, CompiledCriteria
+from .dawg import Dawg
+from .index import WordIndex
+from .planner import QueryPlanner
+from .storage import SortedWordList, CompactWordList, MappedWordList, get_data_path
 from .utils import Utils, ArgumentError, ErrorMessage
 
 
@@ -32,113 +42,716 @@ class SortOrder(Enum):
     DESCENDING = 2
 
 
+class Backend(Enum):
+    '''
+    Enum class providing options for how a Dictionary answers queries.
+
+    Options:
+
+    PYTHON - Lazily built indexes and a query planner (default)
+
+    NUMPY - Whole-array NumPy masks; requires the optional numpy package
+    '''
+    PYTHON = 1
+    NUMPY = 2
+
+
+class Storage(Enum):
+    '''
+    Enum class providing options for how a wordlist is stored.
+
+    Options:
+
+    SET - The set of str as passed, or read from the wordlist text file
+    (default)
+
+    MAPPED - A `MappedWordList` memory-mapped from the prebuilt index file,
+    which loads instantly and shares its pages between processes. Only
+    available for the bundled wordlists
+
+    COMPACT - A `CompactWordList` holding the words in one bytes blob, a
+    fraction of the memory of a set
+
+    DAWG - A `Dawg` sharing the prefixes and suffixes of the words, which
+    answers get_words, get_words_with_any_letters and get_anagrams with
+    pruned graph walks. Slow to build, small once built
+    '''
+    SET = 1
+    MAPPED = 2
+    COMPACT = 3
+    DAWG = 4
+
+
+DEFAULT_CACHE_SIZE = 128
+
+# The type text files are read as: unicode on Python 2, where str is bytes
+_text_type = type(u'')
+
+# The bundled wordlists and their indexes, keyed by (name, storage) and then
+# by component. They are loaded once per process and shared read-only by
+# every Dictionary reading the same source.
+_shared = {}
+_shared_lock = threading.RLock()
+
+
+class _Descending(object):
+    '''Wraps a sort key so that it orders in reverse.'''
+
+    __slots__ = ['key']
+
+    def __init__(self, key):
+        self.key = key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+
 class Dictionary(object):
     '''Class providing utilities for finding words with criteria.'''
 
-    def __init__(self, word_list=None):
+    def __init__(
+            self,
+            word_list=None,
+            backend=Backend.PYTHON,
+            cache_size=DEFAULT_CACHE_SIZE,
+            storage=Storage.SET):
         self.__accepted_chars = set()
+        self.__index = None
+        self.__planner = None
+        self.__numpy = None
+        self.__pool = None
+
+        if not (isinstance(backend, Backend) and isinstance(storage, Storage)):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+        if not (isinstance(cache_size, int) and cache_size >= 0):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+        self.__backend = backend
+        self.__cache = LRUCache(cache_size)
+
+        # The bundled wordlists are only read once a query or iteration
+        # needs them, and are shared with the other instances reading them
+        # until this one changes its wordlist.
+        self.__word_list = None
+        self.__bundled = None
 
         if word_list is None:
-            with open(rf('wordplay', 'data/sample_wordlist.dat')) as wordlist:
-                self.__word_list = set(wordlist.read().split())
+            self.__bundled = ('sample_wordlist', storage)
         elif word_list == 'Scrabble':
-            with open(rf('wordplay', 'data/scrabble_wordlist.dat')) as wordlist:
-                self.__word_list = set(wordlist.read().split())
-        elif isinstance(word_list, set):
+            self.__bundled = ('scrabble_wordlist', storage)
+        elif storage == Storage.MAPPED:
+            # Only the bundled wordlists ship an index file
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+        elif isinstance(word_list, (set, frozenset)) and storage == Storage.COMPACT:
+            self.__word_list = CompactWordList(word_list)
+        elif isinstance(word_list, (set, frozenset)) and storage == Storage.DAWG:
+            self.__word_list = Dawg(word_list)
+        elif isinstance(word_list, (set, frozenset, SortedWordList, Dawg)):
             self.__word_list = word_list
         else:
             raise ArgumentError(ErrorMessage.TYPE_SET)
 
+    @classmethod
+    def from_file(cls, path, lowercase=False, allowed_only=False, **kwargs):
+        '''
+        Creates a dictionary from a wordlist file, reading it line by line.
+
+        Only the resulting wordlist is held in memory, never the whole file
+        text. Files may hold several whitespace-separated words per line
+        and may be gzip-compressed, which is detected from their contents.
+
+        Args:
+            path (`str`): Path of the UTF-8 wordlist file
+            lowercase (`bool`): Whether to lowercase every word
+            allowed_only (`bool`): Whether to skip words containing
+                characters disallowed through `Utils`
+            **kwargs: backend, cache_size and storage, as for `Dictionary`
+
+        Returns:
+            A `Dictionary` of the distinct words in the file
+        '''
+
+        with open(path, 'rb') as f:
+            compressed = f.read(2) == b'\x1f\x8b'
+
+        if compressed:
+            # Python 2's GzipFile lacks the read1 TextIOWrapper needs
+            raw = io.BufferedReader(gzip.open(path, 'rb'))
+            lines = io.TextIOWrapper(raw, encoding='utf-8')
+        else:
+            lines = io.open(path, encoding='utf-8')
+
+        with lines:
+            words = (w for line in lines for w in line.split())
+            return cls.from_iterable(words, lowercase, allowed_only, **kwargs)
+
+    @classmethod
+    def from_iterable(cls, words, lowercase=False, allowed_only=False, **kwargs):
+        '''
+        Creates a dictionary from any iterable of words in a single pass.
+
+        Words are normalized and deduplicated as they are read, so a
+        generator over a large source is never materialized. On Python 2,
+        unicode words are encoded to UTF-8 str.
+
+        Args:
+            words (iterable): The str words
+            lowercase (`bool`): Whether to lowercase every word
+            allowed_only (`bool`): Whether to skip words containing
+                characters disallowed through `Utils`
+            **kwargs: backend, cache_size and storage, as for `Dictionary`
+
+        Returns:
+            A `Dictionary` of the distinct words
+
+        Raises:
+            `ArgumentError`: If a word is not a str or unicode string
+        '''
+
+        word_list = set()
+        for w in words:
+            if not isinstance(w, str):
+                if not isinstance(w, _text_type):
+                    raise ArgumentError(ErrorMessage.TYPE_STR)
+
+                # Python 2 text is kept as UTF-8 str, like every other word
+                w = w.encode('utf-8')
+            if lowercase:
+                w = w.lower()
+            if len(w) == 0 or (allowed_only and not Utils.is_allowed_str(w)):
+                continue
+
+            word_list.add(w)
+
+        return cls(word_list, **kwargs)
+
+    def __get_wordlist(self):
+        if self.__word_list is None:
+            self.__word_list = self.__share('word_list', self.__load)
+
+        return self.__word_list
+
+    def __load(self):
+        name, storage = self.__bundled
+        if storage == Storage.MAPPED:
+            return MappedWordList(get_data_path('%s.idx' % name))
+
+        with open(get_data_path('%s.dat' % name)) as wordlist:
+            words = wordlist.read().split()
+
+        if storage == Storage.COMPACT:
+            return CompactWordList(words)
+        elif storage == Storage.DAWG:
+            return Dawg(words)
+
+        # Shared sets are frozen so that no instance can change the others'
+        return frozenset(words)
+
+    def __share(self, component, build):
+        if self.__bundled is None:
+            return build()
+
+        with _shared_lock:
+            components = _shared.setdefault(self.__bundled, {})
+            if component not in components:
+                components[component] = build()
+
+            return components[component]
+
     def __iter__(self):
-        return iter(self.__word_list)
+        return iter(self.__get_wordlist())
 
     def set_wordlist(self, word_list):
-        if isinstance(word_list, set):
+        '''
+        Replaces its wordlist, dropping its indexes and cached results.
+
+        The set is kept, not copied, and its indexes and cached results are
+        built on top of it, so its words must then only be changed through
+        add_words, remove_words or another set_wordlist. Changing the set
+        directly leaves them stale.
+
+        Args:
+            word_list (`set`, `frozenset`, `SortedWordList` or `Dawg`): The
+                new words
+
+        Raises:
+            `ArgumentError`: If word_list is none of these types
+        '''
+
+        if isinstance(word_list, (set, frozenset, SortedWordList, Dawg)):
             self.__word_list = word_list
+            self.__bundled = None
+            self.__index = None
+            self.__planner = None
+            self.__numpy = None
+            self.__cache.clear()
+
+            if self.__pool is not None:
+                self.start_workers(self.__pool.get_workers())
         else:
             raise ArgumentError(ErrorMessage.TYPE_SET)
 
     def get_wordlist(self):
-        return self.__word_list
+        '''
+        Gets its wordlist.
+
+        This is the set it was given, not a copy; change its words through
+        add_words, remove_words or set_wordlist, as changing the set
+        directly leaves the indexes and cached results stale. Bundled
+        wordlists are shared between dictionaries and returned as a
+        `frozenset`.
+
+        Returns:
+            The `set`, `frozenset`, `SortedWordList` or `Dawg` of its words
+        '''
+
+        return self.__get_wordlist()
+
+    def add_words(self, words):
+        '''
+        Adds words to its wordlist, updating its indexes in place.
+
+        Only what the new words touch is updated: they are inserted in the
+        indexes and NumPy arrays already built, and cached results are
+        dropped. This costs time in the number of new words rather than in
+        the size of the wordlist. A bundled wordlist is shared with other
+        instances and a mapped, compact or DAWG wordlist is immutable, so
+        the first change copies either into a set of its own and its
+        indexes are rebuilt once, lazily. Workers, if started, receive the
+        new words.
+
+        Args:
+            words (iterable): Words to add; those already present are ignored
+
+        Raises:
+            `ArgumentError`: If words is a str or holds anything but
+                non-empty strs
+        '''
+
+        words = self.__check_words(words)
+        self.__fork()
+
+        word_list = self.__get_wordlist()
+        added = [w for w in words if w not in word_list]
+        if len(added) == 0:
+            return
+
+        word_list.update(added)
+        if self.__index is not None:
+            self.__index.add_words(added)
+        if self.__numpy is not None:
+            self.__numpy.add_words(added)
+        if self.__pool is not None:
+            self.__pool.scatter('add_words', added)
+
+        self.__cache.clear()
+
+    def remove_words(self, words):
+        '''
+        Removes words from its wordlist, updating its indexes in place.
+
+        Works like add_words, in time proportional to the removed words.
+
+        Args:
+            words (iterable): Words to remove; those not present are ignored
+
+        Raises:
+            `ArgumentError`: If words is a str or holds anything but
+                non-empty strs
+        '''
+
+        words = self.__check_words(words)
+        self.__fork()
+
+        word_list = self.__get_wordlist()
+        removed = [w for w in words if w in word_list]
+        if len(removed) == 0:
+            return
+
+        word_list.difference_update(removed)
+        if self.__index is not None:
+            self.__index.remove_words(removed)
+        if self.__numpy is not None:
+            self.__numpy.remove_words(removed)
+        if self.__pool is not None:
+            self.__pool.map('remove_words', removed)
+
+        self.__cache.clear()
+
+    def __check_words(self, words):
+        if isinstance(words, str):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+        try:
+            words = sorted(set(words))
+        except TypeError:
+            raise ArgumentError(ErrorMessage.INVALID_STR)
+
+        for w in words:
+            if not (isinstance(w, str) and len(w) != 0):
+                raise ArgumentError(ErrorMessage.INVALID_STR)
+
+        return words
+
+    def __fork(self):
+        # Shared and immutable wordlists are copied into a set of this
+        # instance's own before the first change.
+        word_list = self.__get_wordlist()
+        if not isinstance(word_list, set) or self.__bundled is not None:
+            self.__word_list = set(word_list)
+            self.__bundled = None
+            self.__index = None
+            self.__planner = None
+            self.__numpy = None
+
+    def get_cache_info(self):
+        '''
+        Gets the statistics of the query result cache.
+
+        Returns:
+            A `CacheInfo` named tuple of hits, misses, evictions, maxsize and
+            currsize
+        '''
+
+        return self.__cache.get_info()
+
+    def set_cache_size(self, cache_size):
+        '''
+        Sets how many query results are cached, evicting if needed.
+
+        Args:
+            cache_size (`int`): Maximum number of results, 0 to disable
+
+        Raises:
+            `ArgumentError`: If cache_size is not an int >= 0
+        '''
+
+        if not (isinstance(cache_size, int) and cache_size >= 0):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+        self.__cache.set_maxsize(cache_size)
+
+    def clear_cache(self):
+        '''Drop every cached query result.'''
+
+        self.__cache.clear()
+
+    def __from_cache(self, key):
+        result = self.__cache.get(key)
+        return None if result is None else list(result)
+
+    def __to_cache(self, key, result):
+        # Results are copied so callers cannot change the cached one, which
+        # is wasted work when nothing is cached.
+        if self.__cache.get_maxsize() != 0:
+            self.__cache.put(key, list(result))
+
+        return result
+
+    def start_workers(self, workers=None):
+        '''
+        Opt in to running queries on a pool of worker processes.
+
+        The wordlist is split into one shard per worker and each shard is
+        shipped to its worker once, now. From then on get_words,
+        get_words_many and get_words_with_any_letters run on every shard in
+        parallel and the results are merged in the requested order.
+        set_wordlist restarts the workers with the new wordlist.
+
+        Args:
+            workers (`int`): Number of worker processes, or None for one per
+                CPU
+        '''
+
+        from .parallel import ShardPool
+
+        if workers is not None and not Utils.is_positive_integer(workers):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+        self.stop_workers()
+        self.__pool = ShardPool(self.__get_wordlist(), workers, self.__backend)
 
-    def __get_all_substrings(self, word):
-        ln = len(word)
-        return [word[i: j] for i in range(ln) for j in range(i + 1, ln + 1)]
+    def stop_workers(self):
+        '''Stop the worker processes, if any, and query in this process.'''
+
+        if self.__pool is not None:
+            self.__pool.shutdown()
+            self.__pool = None
+
+    def __get_index(self):
+        if self.__index is None:
+            self.__index = self.__share(
+                'index', lambda: WordIndex(self.__get_wordlist()))
+
+        return self.__index
+
+    def __get_numpy(self):
+        if self.__numpy is None:
+            from .numpy_backend import NumpyBackend
+            self.__numpy = self.__share(
+                'numpy', lambda: NumpyBackend(self.__get_wordlist()))
+
+        return self.__numpy
+
+    def __get_engine(self):
+        if self.__backend == Backend.NUMPY:
+            return self.__get_numpy()
+        elif isinstance(self.__get_wordlist(), Dawg):
+            return self.__word_list
+
+        return self.__get_index()
+
+    def __uses_planner(self):
+        # NumPy masks and DAWG walks answer get_words without the planner
+        return self.__backend == Backend.PYTHON and not isinstance(
+            self.__get_wordlist(), Dawg)
+
+    def __get_planner(self):
+        if self.__planner is None:
+            self.__planner = self.__share('planner', lambda: QueryPlanner(
+                self.__get_wordlist(), self.__get_index()))
+
+        return self.__planner
+
+    def __compile(self, criteria):
+        if isinstance(criteria, CompiledCriteria):
+            return criteria
+        elif isinstance(criteria, Criteria):
+            return criteria.compile()
+
+        raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+    def __merge(self, results):
+        merged = []
+        for result in results:
+            merged.extend(result)
+
+        return merged
+
+    def __sort_words(self, result, sort_order, sort_type, key=None):
+        if sort_order == SortOrder.ASCENDING:
+            result.sort(key=key)
+        else:
+            result.sort(key=key, reverse=True)
+
+        if sort_type == SortType.SIZE:
+            if key is None:
+                result.sort(key=len)
+            else:
+                result.sort(key=lambda r: len(key(r)))
+
+    def __select_words(self, result, sort_order, sort_type, key, top_k, offset):
+        if top_k is None:
+            self.__sort_words(result, sort_order, sort_type, key)
+            return result[offset:] if offset != 0 else result
+
+        # heapq's selections are stable, like the sorts they stand in for,
+        # so a page comes out exactly as it would from the sorted list.
+        if key is None:
+            key = str
+        n = offset + top_k
+
+        if sort_type == SortType.SIZE and sort_order == SortOrder.ASCENDING:
+            page = heapq.nsmallest(n, result, key=lambda r: (len(key(r)), key(r)))
+        elif sort_type == SortType.SIZE:
+            page = heapq.nsmallest(
+                n, result, key=lambda r: (len(key(r)), _Descending(key(r))))
+        elif sort_order == SortOrder.ASCENDING:
+            page = heapq.nsmallest(n, result, key=key)
+        else:
+            page = heapq.nlargest(n, result, key=key)
+
+        return page[offset:]
+
+    def __check_wildcard(self, wildcard):
+        if wildcard is None:
+            return
+
+        if not (isinstance(wildcard, str) and len(wildcard) == 1):
+            raise ArgumentError(ErrorMessage.TYPE_CHAR)
+
+    def __check_word(self, word):
+        try:
+            Utils.validate_args(word)
+        except ArgumentError as err:
+            raise err
+
+        return str(word)
+
+    def __check_length(self, word, length):
+        if length is None:
+            return None
+
+        if not Utils.is_positive_integer(length):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+        length = int(length)
+        if length > len(word):
+            raise ArgumentError(ErrorMessage.LEN_GRTR_WORD)
+
+        return length
+
+    def __check_limit(self, limit):
+        if limit is not None and not (isinstance(limit, int) and limit >= 0):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+    def __check_page(self, top_k, offset):
+        self.__check_limit(top_k)
+
+        if not (isinstance(offset, int) and offset >= 0):
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+    def __split_wildcard(self, word, wildcard):
+        return word.replace(wildcard, ''), word.count(wildcard)
 
     def get_words(self, criteria):
         '''
         Gets words from its wordlist given valid search criteria.
 
         Args:
-            criteria (`Criteria`): Object containing search parameters
+            criteria (`Criteria` or `CompiledCriteria`): Object containing
+                search parameters. Compile criteria that are run repeatedly
+                to pay their setup cost once
 
         Returns:
             A list of words from its wordlist matching the criteria
 
         Raises:
-            `ArgumentError`: If arg is not of type Criteria
+            `ArgumentError`: If arg is not of type Criteria or
+                CompiledCriteria
         '''
 
-        if not isinstance(criteria, Criteria):
-            raise ArgumentError(ErrorMessage.INVALID_ARG)
+        criteria = self.__compile(criteria)
+        key = ('get_words', criteria.get_key())
 
-        begins = criteria.get_begins_with()
-        ends = criteria.get_ends_with()
-        u_contains = criteria.get_contains()
-        o_contains = criteria.get_contains_at()
-        size = criteria.get_size()
+        result = self.__from_cache(key)
+        if result is None:
+            result = self.__to_cache(key, self.__find_words(criteria))
 
-        has_u_contains = len(u_contains) is not 0
-        has_o_contains = len(o_contains) is not 0
-        has_begins = len(begins) is not 0
-        has_ends = len(ends) is not 0
-        has_size = size is not None and size is not 0
+        return result
 
-        result = []
+    def __find_words(self, criteria):
+        if self.__pool is not None:
+            return self.__merge(self.__pool.map('get_words', criteria))
+        elif not self.__uses_planner():
+            return self.__get_engine().get_words(criteria)
 
-        for w in self.__word_list:
-            if has_size and len(w) != size:
-                continue
+        return self.__get_planner().execute(criteria)
+
+    def iter_words(self, criteria, limit=None):
+        '''
+        Yields words from its wordlist matching search criteria, as they are
+        found.
+
+        Unlike get_words, nothing is cached and the search stops as soon as
+        limit words are found or the caller stops iterating, so asking for
+        the first few matches of a broad query is cheap.
 
-            if has_begins:
-                if len(w) < len(begins):
-                    continue
-                elif w[:len(begins)] != begins:
-                    continue
+        Args:
+            criteria (`Criteria` or `CompiledCriteria`): Object containing
+                search parameters
+            limit (`int`): Maximum number of words to yield, or None for all
 
-            if has_ends:
-                if len(w) < len(ends):
-                    continue
-                elif w[-len(ends):] != ends:
-                    continue
+        Returns:
+            An iterator over the words matching the criteria
 
-            if has_u_contains:
-                is_match = True
-                for c in u_contains:
-                    if w.count(c) < u_contains.count(c):
-                        is_match = False
-                        break
+        Raises:
+            `ArgumentError`: If criteria is not of type Criteria or
+                CompiledCriteria, or limit is not an int >= 0
+        '''
 
-                if not is_match:
-                    continue
+        criteria = self.__compile(criteria)
+        self.__check_limit(limit)
 
-            if has_o_contains:
-                is_match = True
-                for k, v in o_contains.items():
-                    if k > len(w) - 1:
-                        is_match = False
-                        break
+        return islice(self.__iter_words(criteria, limit), limit)
 
-                    if w[k - 1] != v:
-                        is_match = False
-                        break
+    def __iter_words(self, criteria, limit):
+        if self.__pool is not None or self.__backend == Backend.NUMPY:
+            return iter(self.__find_words(criteria))
+        elif not self.__uses_planner():
+            return self.__get_engine().iter_words(criteria)
 
-                if not is_match:
-                    continue
+        return self.__get_planner().iterate(criteria, limit)
 
-            result.append(w)
+    def get_words_many(self, criteria_list):
+        '''
+        Gets words for a batch of search criteria at once.
 
-        return result
+        Sharing the work makes this much cheaper than calling get_words for
+        each criteria, and identical criteria are answered once. With the
+        index backend, criteria using the same index range read it once,
+        and all criteria needing a full scan share a single pass over the
+        wordlist. With the NumPy backend, each constraint mask is computed
+        once for every criteria using it. With DAWG storage, criteria
+        differing only in ends_with and contains share one walk.
+
+        Args:
+            criteria_list (`list`): `Criteria` or `CompiledCriteria` objects
+
+        Returns:
+            A list holding, for each criteria in order, the list of words
+            from its wordlist matching it
+
+        Raises:
+            `ArgumentError`: If an element is not of type Criteria or
+                CompiledCriteria
+        '''
+
+        criterias = [self.__compile(criteria) for criteria in criteria_list]
+        keys = [('get_words', criteria.get_key()) for criteria in criterias]
+
+        results = [self.__from_cache(key) for key in keys]
+        missing = [c for c, r in zip(criterias, results) if r is None]
+        found = iter(self.__find_words_many(missing))
+
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                results[i] = self.__to_cache(key, next(found))
+
+        return results
+
+    def __find_words_many(self, criterias):
+        if len(criterias) == 0:
+            return []
+        elif self.__pool is not None:
+            shards = self.__pool.map('get_words_many', criterias)
+            return [self.__merge(results) for results in zip(*shards)]
+        elif not self.__uses_planner():
+            return self.__get_engine().get_words_many(criterias)
+
+        return self.__get_planner().execute_many(criterias)
+
+    def explain(self, criteria):
+        '''
+        Shows how get_words answers a query, for debugging slow queries.
+
+        The query is run once so that the plan can report the candidates
+        it actually read next to the planner's estimate. Plans describe the
+        index backend, whichever backend the dictionary uses.
+
+        Args:
+            criteria (`Criteria` or `CompiledCriteria`): Object containing
+                search parameters
+
+        Returns:
+            A `QueryPlan` with the chosen access path, the estimated and
+            actual candidate counts and the residual filters
+
+        Raises:
+            `ArgumentError`: If arg is not of type Criteria or
+                CompiledCriteria
+        '''
+
+        criteria = self.__compile(criteria)
+        planner = self.__get_planner()
+        plan = planner.plan(criteria)
+        planner.execute(criteria, plan)
+
+        return plan
 
     # use kwargs for sort stuff
     def get_words_with_any_letters(
@@ -146,64 +759,109 @@ class Dictionary(object):
             word,
             length=None,
             sort_order=SortOrder.ASCENDING,
-            sort_type=SortType.ALPHA):
+            sort_type=SortType.ALPHA,
+            wildcard=None,
+            top_k=None,
+            offset=0):
         '''
         Gets words from its wordlist that contain any of the letters in word
 
         Args:
             word (`str`): Letters to pool words from
+            wildcard (`str`): Optional blank tile character, e.g. '?'. Each
+                occurrence in word matches any single letter
+            top_k (`int`): Return only this many words of the sorted result,
+                or None for all. Selecting a page costs O(m log(offset +
+                top_k)) rather than a full sort
+            offset (`int`): Number of sorted words to skip before the page
 
         Returns:
-            A list of words from its wordlist containing any letters in word
+            A list of words from its wordlist containing any letters in word.
+            If wildcard is set, a list of (word, used) tuples instead, where
+            used holds the letters the blanks stood for in sorted order
 
         Raises:
             `ArgumentError`
         '''
 
-        try:
-            Utils.validate_args(word)
-        except ArgumentError as err:
-            raise err
+        word = self.__check_word(word)
+        length = self.__check_length(word, length)
+        self.__check_wildcard(wildcard)
+        self.__check_page(top_k, offset)
 
-        word = str(word)
-        result = []
-        has_length = False
+        key = (
+            'get_words_with_any_letters',
+            word,
+            length,
+            sort_order,
+            sort_type,
+            wildcard,
+            top_k,
+            offset)
+
+        result = self.__from_cache(key)
+        if result is None:
+            result = self.__to_cache(key, self.__find_rack_words(
+                word,
+                length,
+                sort_order,
+                sort_type,
+                wildcard,
+                top_k,
+                offset))
 
-        if length is not None:
-            if not Utils.is_positive_integer(length):
-                raise ArgumentError(ErrorMessage.INVALID_ARG)
+        return result
 
-            length = int(length)
-            if length > len(word):
-                raise ArgumentError(ErrorMessage.LEN_GRTR_WORD)
-            has_length = True
+    def __find_rack_words(
+            self, word, length, sort_order, sort_type, wildcard, top_k, offset):
+        result = list(self.__iter_rack_words(word, length, wildcard))
+        key = None if wildcard is None else itemgetter(0)
 
-        for w in self.__word_list:
-            w = w.lower()
+        return self.__select_words(result, sort_order, sort_type, key, top_k, offset)
 
-            if has_length and len(w) != length:
-                continue
-            elif len(w) > len(word):
-                continue
+    def __iter_rack_words(self, word, length, wildcard):
+        if self.__pool is not None:
+            return iter(self.__merge(self.__pool.map(
+                'get_words_with_any_letters',
+                word,
+                length,
+                wildcard=wildcard)))
+        elif wildcard is not None:
+            letters, blanks = self.__split_wildcard(word, wildcard)
+            index = self.__get_engine()
+            return iter(index.get_blank_rack_words(letters, blanks, length))
 
-            is_match = True
-            for c in w:
-                if not w.count(c) <= word.count(c):
-                    is_match = False
-                    break
+        return iter(self.__get_engine().get_rack_words(word, length))
 
-            if is_match:
-                result.append(w)
+    def iter_words_with_any_letters(self, word, length=None, wildcard=None, limit=None):
+        '''
+        Yields words from its wordlist that contain any of the letters in word,
+        as they are found.
 
-        if sort_order == SortOrder.ASCENDING:
-            result.sort()
-        else:
-            result.sort(reverse=True)
+        Unlike get_words_with_any_letters, nothing is sorted or cached, so
+        callers that only need the first few matches or a count stop the
+        search as soon as they stop iterating.
 
-        if sort_type == SortType.SIZE:
-            result.sort(key=len)
+        Args:
+            word (`str`): Letters to pool words from
+            length (`int`): Exact length of the words, or None for any
+            wildcard (`str`): Optional blank tile character, e.g. '?'
+            limit (`int`): Maximum number of words to yield, or None for all
 
-        return result
+        Returns:
+            An iterator over the words, or over (word, used) tuples if
+            wildcard is set
+
+        Raises:
+            `ArgumentError`
+        '''
+
+        word = self.__check_word(word)
+        length = self.__check_length(word, length)
+        self.__check_wildcard(wildcard)
+        self.__check_limit(limit)
+
+        return islice(self.__iter_rack_words(word, length, wildcard), limit)
 
     # use kwargs for sort stuff
     def get_words_within(
@@ -211,12 +869,17 @@ class Dictionary(object):
             word,
             length=None,
             sort_order=SortOrder.ASCENDING,
-            sort_type=SortType.ALPHA):
+            sort_type=SortType.ALPHA,
+            top_k=None,
+            offset=0):
         '''
         Gets words from its wordlist that are substrings of word
 
         Args:
             word (`str`): Letters to pool words from
+            top_k (`int`): Return only this many words of the sorted result,
+                or None for all
+            offset (`int`): Number of sorted words to skip before the page
 
         Returns:
             A list of words from its wordlist that are substrings of word
@@ -225,72 +888,172 @@ class Dictionary(object):
             `ArgumentError`
         '''
 
-        try:
-            Utils.validate_args(word)
-        except ArgumentError as err:
-            raise err
+        word = self.__check_word(word)
+        length = self.__check_length(word, length)
+        self.__check_page(top_k, offset)
 
-        word = str(word)
-        result = []
-        has_length = False
+        key = (
+            'get_words_within',
+            word,
+            length,
+            sort_order,
+            sort_type,
+            top_k,
+            offset)
 
-        if length is not None:
-            if not Utils.is_positive_integer(length):
-                raise ArgumentError(ErrorMessage.INVALID_ARG)
+        cached = self.__from_cache(key)
+        if cached is not None:
+            return cached
 
-            length = int(length)
-            if length > len(word):
-                raise ArgumentError(ErrorMessage.LEN_GRTR_WORD)
-            has_length = True
+        result = list(self.__iter_words_within(word, length))
+        result = self.__select_words(
+            result, sort_order, sort_type, None, top_k, offset)
 
-        substrs = self.__get_all_substrings(word)
+        return self.__to_cache(key, result)
 
-        for w in substrs:
-            if has_length and len(w) != length:
-                continue
+    def __iter_words_within(self, word, length):
+        word_list = self.__get_wordlist()
+        if isinstance(word_list, Dawg):
+            found = word_list.get_words_within(word, length)
+        else:
+            found = self.__get_index().get_words_within(word, length)
 
-            if w in self.__word_list and w not in result:
-                result.append(w)
+        seen = set()
+        for w in found:
+            if w not in seen:
+                seen.add(w)
+                yield w
 
-        if sort_order == SortOrder.ASCENDING:
-            result.sort()
-        else:
-            result.sort(reverse=True)
+    def iter_words_within(self, word, length=None, limit=None):
+        '''
+        Yields words from its wordlist that are substrings of word, as they
+        are found.
 
-        if sort_type == SortType.SIZE:
-            result.sort(key=len)
+        Args:
+            word (`str`): Letters to pool words from
+            length (`int`): Exact length of the words, or None for any
+            limit (`int`): Maximum number of words to yield, or None for all
 
-        return result
+        Returns:
+            An iterator over the words, unsorted
+
+        Raises:
+            `ArgumentError`
+        '''
+
+        word = self.__check_word(word)
+        length = self.__check_length(word, length)
+        self.__check_limit(limit)
+
+        return islice(self.__iter_words_within(word, length), limit)
 
     # use kwargs for sort stuff
     def get_anagrams(
             self,
             word,
             sort_order=SortOrder.ASCENDING,
-            sort_type=SortType.ALPHA):
+            sort_type=SortType.ALPHA,
+            wildcard=None,
+            top_k=None,
+            offset=0):
         '''
         Gets all anagrams of a word from the wordlist
 
         Args:
             word (`str`): Letters to pool words from
+            wildcard (`str`): Optional blank tile character, e.g. '?'. Each
+                occurrence in word matches any single letter
+            top_k (`int`): Return only this many words of the sorted result,
+                or None for all
+            offset (`int`): Number of sorted words to skip before the page
 
         Returns:
-            A list of words from its wordlist that are anagrams of word
+            A list of words from its wordlist that are anagrams of word.
+            If wildcard is set, a list of (word, used) tuples instead, where
+            used holds the letters the blanks stood for in sorted order
 
         Raises:
             `ArgumentError`
         '''
 
-        result = self.get_words_with_any_letters(
+        word = self.__check_anagram_word(word)
+        self.__check_wildcard(wildcard)
+        self.__check_page(top_k, offset)
+
+        key = (
+            'get_anagrams',
             word,
-            len(word),
             sort_order,
-            sort_type)
-
-        if word in result:
-            result.remove(word)
+            sort_type,
+            wildcard,
+            top_k,
+            offset)
+
+        result = self.__from_cache(key)
+        if result is None:
+            result = self.__to_cache(key, self.__find_anagrams(
+                word,
+                sort_order,
+                sort_type,
+                wildcard,
+                top_k,
+                offset))
 
         return result
 
+    def __check_anagram_word(self, word):
+        word = self.__check_word(word)
+        if len(word) == 0:
+            raise ArgumentError(ErrorMessage.INVALID_ARG)
+
+        return word
+
+    def __find_anagrams(self, word, sort_order, sort_type, wildcard, top_k, offset):
+        result = list(self.__iter_anagrams(word, wildcard))
+        key = None if wildcard is None else itemgetter(0)
+
+        return self.__select_words(result, sort_order, sort_type, key, top_k, offset)
+
+    def __iter_anagrams(self, word, wildcard):
+        index = self.__get_engine()
+
+        if wildcard is not None:
+            letters, blanks = self.__split_wildcard(word, wildcard)
+            words = index.get_blank_rack_words(letters, blanks, len(word))
+            itself = (word, '')
+        else:
+            words = index.get_anagrams(word)
+            itself = word
+
+        # The word is not its own anagram
+        for w in words:
+            if w == itself:
+                itself = None
+            else:
+                yield w
+
+    def iter_anagrams(self, word, wildcard=None, limit=None):
+        '''
+        Yields anagrams of a word from the wordlist, as they are found.
+
+        Args:
+            word (`str`): Letters to pool words from
+            wildcard (`str`): Optional blank tile character, e.g. '?'
+            limit (`int`): Maximum number of words to yield, or None for all
+
+        Returns:
+            An iterator over the words, or over (word, used) tuples if
+            wildcard is set
+
+        Raises:
+            `ArgumentError`
+        '''
+
+        word = self.__check_anagram_word(word)
+        self.__check_wildcard(wildcard)
+        self.__check_limit(limit)
+
+        return islice(self.__iter_anagrams(word, wildcard), limit)
+
 
-__all__ = ['Dictionary', 'SortType', 'SortOrder']
+__all__ = ['Dictionary', 'SortType', 'SortOrder', 'Backend', 'Storage']
@@ -0,0 +1,633 @@
+from array import array
+from bisect import bisect_left, insort
+from .storage import SortedWordList
+
+GRAM_SIZE = 3
+
+
+class WordIndex(object):
+    '''
+    Class providing lookup structures over a word list.
+
+    Every structure is built lazily the first time a query needs it, so a
+    `Dictionary` only pays for the access paths it actually uses. A
+    `SortedWordList` already holds the sorted words, the length buckets and
+    the anagram signatures, so those are read from it instead of built, and
+    the reversed words and the word table are views of it rather than lists
+    of str. An index over a `SortedWordList` cannot be updated.
+    '''
+
+    def __init__(self, word_list):
+        self.__word_list = word_list
+        self.__store = None
+        if isinstance(word_list, SortedWordList):
+            self.__store = word_list
+        self.__by_length = None
+        self.__sorted = None
+        self.__reversed = None
+        self.__by_signature = None
+        self.__signatures = None
+        self.__alphabet = None
+        self.__table = None
+        self.__ids = None
+        self.__positions = None
+        self.__grams = None
+
+    def __get_by_length(self):
+        if self.__by_length is None:
+            by_length = {}
+            for w in self.__word_list:
+                ln = len(w)
+                if ln in by_length:
+                    by_length[ln].append(w)
+                else:
+                    by_length[ln] = [w]
+
+            # Sorted buckets take added and removed words by binary search
+            for bucket in by_length.values():
+                bucket.sort()
+
+            self.__by_length = by_length
+
+        return self.__by_length
+
+    def __get_sorted(self):
+        if self.__sorted is None:
+            if self.__store is not None:
+                self.__sorted = self.__store
+            else:
+                self.__sorted = sorted(self.__word_list)
+
+        return self.__sorted
+
+    def __get_reversed(self):
+        if self.__reversed is None:
+            if self.__store is not None:
+                self.__reversed = self.__store.get_reversed_words()
+            else:
+                self.__reversed = sorted(w[::-1] for w in self.__word_list)
+
+        return self.__reversed
+
+    def __get_by_signature(self):
+        if self.__by_signature is None:
+            by_signature = {}
+            for w in self.__word_list:
+                w = self.__lower(w)
+                sig = self.get_signature(w)
+                if sig in by_signature:
+                    by_signature[sig].append(w)
+                else:
+                    by_signature[sig] = [w]
+
+            self.__by_signature = by_signature
+
+        return self.__by_signature
+
+    def __lower(self, word):
+        # lower() always makes a new str, so words already in lowercase are
+        # kept as they are rather than stored twice.
+        return word if word.islower() else word.lower()
+
+    def __get_signatures(self):
+        if self.__signatures is None:
+            if self.__store is not None:
+                self.__signatures = self.__store.get_signatures()
+            else:
+                self.__signatures = sorted(self.__get_by_signature())
+
+        return self.__signatures
+
+    def __get_signature_words(self, signature):
+        if self.__store is not None:
+            return self.__store.get_words_with_signature(signature)
+
+        return self.__get_by_signature().get(signature, [])
+
+    def __get_table(self):
+        if self.__table is None:
+            if self.__store is not None:
+                self.__table = self.__store
+            else:
+                self.__table = list(self.__word_list)
+
+        return self.__table
+
+    def __get_ids(self):
+        if self.__ids is None:
+            table = self.__get_table()
+            self.__ids = dict((w, i) for i, w in enumerate(table) if w is not None)
+
+        return self.__ids
+
+    def __get_positions(self):
+        if self.__positions is None:
+            positions = {}
+            for i, w in enumerate(self.__get_table()):
+                if w is not None:
+                    self.__post_positions(positions, i, w)
+
+            self.__positions = positions
+
+        return self.__positions
+
+    def __post_positions(self, positions, i, word):
+        for k, c in enumerate(word, 1):
+            key = (k, c)
+            if key not in positions:
+                positions[key] = array('I')
+            positions[key].append(i)
+
+    def __get_grams(self):
+        if self.__grams is None:
+            grams = {}
+            for i, w in enumerate(self.__get_table()):
+                if w is not None:
+                    self.__post_grams(grams, i, w)
+
+            self.__grams = grams
+
+        return self.__grams
+
+    def __post_grams(self, grams, i, word):
+        for gram in self.__split_grams(word, range(1, GRAM_SIZE + 1)):
+            if gram not in grams:
+                grams[gram] = array('I')
+            grams[gram].append(i)
+
+    def __split_grams(self, word, sizes):
+        grams = set()
+        for n in sizes:
+            grams.update(word[i:i + n] for i in range(len(word) - n + 1))
+
+        return grams
+
+    def __get_substring_postings(self, substring):
+        n = min(len(substring), GRAM_SIZE)
+        grams = self.__get_grams()
+
+        return [grams.get(g, []) for g in self.__split_grams(substring, [n])]
+
+    def __intersect(self, postings):
+        postings = sorted(postings, key=len)
+        if len(postings) == 0:
+            return [w for w in self.__get_table() if w is not None]
+
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            if len(ids) == 0:
+                break
+            ids.intersection_update(posting)
+
+        # Removed words leave their ids in the postings, so their table
+        # slots are skipped.
+        table = self.__table
+        return [table[i] for i in sorted(ids) if table[i] is not None]
+
+    def __has_prefix(self, words, prefix):
+        i = bisect_left(words, prefix)
+        return i < len(words) and words[i][:len(prefix)] == prefix
+
+    def __get_alphabet(self):
+        if self.__alphabet is None:
+            if self.__store is not None:
+                self.__alphabet = self.__store.get_alphabet()
+            else:
+                alphabet = set()
+                for sig in self.__get_by_signature():
+                    alphabet.update(sig)
+
+                self.__alphabet = alphabet
+
+        return self.__alphabet
+
+    def __walk_rack(self, rack, blanks, length):
+        signatures = self.__get_signatures()
+
+        # capacity[j] is how many tiles are left once letters before j
+        # are settled, not counting blanks
+        capacity = [0] * (len(rack) + 1)
+        for j in range(len(rack) - 1, -1, -1):
+            capacity[j] = capacity[j + 1] + rack[j][1]
+
+        # Each entry is a signature built from rack letters in order, the
+        # first rack letter that may still be added, the blanks left and
+        # the letters the spent blanks stood for.
+        stack = [('', 0, blanks, '')]
+        while len(stack) != 0:
+            sig, start, left, used = stack.pop()
+            ln = len(sig)
+
+            if length is None or ln == length:
+                for w in self.__get_signature_words(sig):
+                    yield w, used
+
+                if length is not None:
+                    continue
+
+            for j in range(start, len(rack)):
+                if length is not None and ln + capacity[j] + left < length:
+                    break
+
+                c, count = rack[j]
+                for k in range(1, count + left + 1):
+                    # Copies beyond what the rack holds are paid for with
+                    # blanks.
+                    deficit = max(k - count, 0)
+                    if length is not None:
+                        if ln + k > length:
+                            break
+                        elif ln + k + capacity[j + 1] + left - deficit < length:
+                            continue
+
+                    nxt = sig + c * k
+                    if not self.__has_prefix(signatures, nxt):
+                        break
+
+                    stack.append((nxt, j + 1, left - deficit, used + c * deficit))
+
+    def __get_rack(self, letters, blanks):
+        counts = {}
+        for c in letters:
+            counts[c] = counts.get(c, 0) + 1
+
+        if blanks > 0:
+            for c in self.__get_alphabet():
+                counts.setdefault(c, 0)
+
+        return [[c, counts[c]] for c in sorted(counts)]
+
+    def __get_range(self, words, prefix):
+        lo = bisect_left(words, prefix)
+        last = ord(prefix[-1])
+
+        try:
+            upper = prefix[:-1] + chr(last + 1)
+        except (ValueError, OverflowError):
+            # Nothing sorts after the last code point, so the range ends
+            # where the range of the shorter prefix does.
+            if len(prefix) == 1:
+                return lo, len(words)
+            return lo, self.__get_range(words, prefix[:-1])[1]
+
+        return lo, bisect_left(words, upper, lo)
+
+    def __narrow(self, words, prefix, lo, hi):
+        # Every word in [lo, hi) already starts with prefix[:-1]
+        lo = bisect_left(words, prefix, lo, hi)
+
+        try:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        except (ValueError, OverflowError):
+            return lo, hi
+
+        return lo, bisect_left(words, upper, lo, hi)
+
+    def add_words(self, words):
+        '''
+        Updates the structures already built for words added to the list.
+
+        Structures not built yet will be built from the updated list, so
+        only the built ones are patched: words are inserted in the sorted
+        arrays and length buckets, appended to their signature buckets,
+        and numbered at the end of the table, so their ids only ever extend
+        the postings.
+
+        Args:
+            words (`list`): Words just added to the word list; none of them
+                may already have been in it
+        '''
+
+        if self.__by_length is not None:
+            for w in words:
+                insort(self.__by_length.setdefault(len(w), []), w)
+
+        if self.__sorted is not None:
+            for w in words:
+                insort(self.__sorted, w)
+
+        if self.__reversed is not None:
+            for w in words:
+                insort(self.__reversed, w[::-1])
+
+        if self.__by_signature is not None:
+            for w in words:
+                w = self.__lower(w)
+                sig = self.get_signature(w)
+                if sig not in self.__by_signature:
+                    self.__by_signature[sig] = []
+                    if self.__signatures is not None:
+                        insort(self.__signatures, sig)
+                self.__by_signature[sig].append(w)
+
+        if self.__alphabet is not None:
+            for w in words:
+                self.__alphabet.update(w.lower())
+
+        if self.__table is not None:
+            for w in words:
+                i = len(self.__table)
+                self.__table.append(w)
+
+                if self.__ids is not None:
+                    self.__ids[w] = i
+                if self.__positions is not None:
+                    self.__post_positions(self.__positions, i, w)
+                if self.__grams is not None:
+                    self.__post_grams(self.__grams, i, w)
+
+    def remove_words(self, words):
+        '''
+        Updates the structures already built for words removed from the list.
+
+        Words are taken out of their buckets and the sorted arrays. Their
+        table slots are emptied rather than renumbered, so the postings keep
+        their ids and skip them when read. The alphabet is left as it is;
+        letters no word uses any more only add branches a walk prunes.
+
+        Args:
+            words (`list`): Words just removed from the word list; all of
+                them must have been in it
+        '''
+
+        if self.__by_length is not None:
+            for w in words:
+                bucket = self.__by_length[len(w)]
+                del bucket[bisect_left(bucket, w)]
+                if len(bucket) == 0:
+                    del self.__by_length[len(w)]
+
+        if self.__sorted is not None:
+            for w in words:
+                del self.__sorted[bisect_left(self.__sorted, w)]
+
+        if self.__reversed is not None:
+            for w in words:
+                del self.__reversed[bisect_left(self.__reversed, w[::-1])]
+
+        if self.__by_signature is not None:
+            for w in words:
+                w = w.lower()
+                sig = self.get_signature(w)
+                bucket = self.__by_signature[sig]
+                bucket.remove(w)
+                if len(bucket) == 0:
+                    del self.__by_signature[sig]
+                    if self.__signatures is not None:
+                        del self.__signatures[bisect_left(self.__signatures, sig)]
+
+        if self.__table is not None:
+            ids = self.__get_ids()
+            for w in words:
+                self.__table[ids.pop(w)] = None
+
+    @staticmethod
+    def get_signature(letters):
+        '''
+        Gets the anagram signature of a string: its letters in sorted order.
+
+        Args:
+            letters (`str`): String to sign
+
+        Returns:
+            A str that is equal for two strings iff they are anagrams
+        '''
+
+        return ''.join(sorted(letters))
+
+    def get_anagrams(self, letters):
+        '''
+        Gets the words made of exactly the given letters with one hash probe.
+
+        Words are matched and returned in lowercase.
+
+        Args:
+            letters (`str`): Letters the words should be made of
+
+        Returns:
+            A list of the lowercased words. Callers must not modify it.
+        '''
+
+        return self.__get_signature_words(self.get_signature(letters))
+
+    def get_rack_words(self, letters, length=None):
+        '''
+        Gets the words that can be formed from a rack of letters.
+
+        Walks the sub-multisets of the rack in signature order and prunes
+        every branch no signature starts with, so the cost follows the
+        rack and the answers rather than the size of the word list. Words
+        are matched and returned in lowercase.
+
+        Args:
+            letters (`str`): Rack of letters; each may be used once per
+                occurrence
+            length (`int`): Exact length of the words, or None for any
+
+        Returns:
+            A generator over the lowercased words
+        '''
+
+        walk = self.__walk_rack(self.__get_rack(letters, 0), 0, length)
+
+        return (w for w, _ in walk)
+
+    def get_blank_rack_words(self, letters, blanks, length=None):
+        '''
+        Gets the words that can be formed from a rack holding blank tiles.
+
+        Works like `get_rack_words`, except that each letter a word needs
+        beyond what the rack holds consumes one of the blanks. Branches are
+        still pruned on signature prefixes, and a branch is abandoned as
+        soon as its deficit exceeds the blanks left.
+
+        Args:
+            letters (`str`): Rack of letters, without the blanks
+            blanks (`int`): Number of blank tiles that match any letter
+            length (`int`): Exact length of the words, or None for any
+
+        Returns:
+            A generator over (word, used) tuples, where used holds the
+            letters the blanks stood for in sorted order
+        '''
+
+        return self.__walk_rack(self.__get_rack(letters, blanks), blanks, length)
+
+    def get_prefix_range(self, prefix):
+        '''
+        Gets the bounds of the words starting with a prefix.
+
+        Args:
+            prefix (`str`): Non-empty string the words should begin with
+
+        Returns:
+            A tuple (lo, hi) such that the sorted words in [lo, hi) are
+            exactly the words beginning with prefix
+        '''
+
+        return self.__get_range(self.__get_sorted(), prefix)
+
+    def get_words_with_prefix(self, prefix):
+        '''
+        Gets the words starting with a prefix in O(log n + k).
+
+        Args:
+            prefix (`str`): Non-empty string the words should begin with
+
+        Returns:
+            A sorted list of the words beginning with prefix
+        '''
+
+        lo, hi = self.get_prefix_range(prefix)
+        return self.__get_sorted()[lo:hi]
+
+    def get_suffix_range(self, suffix):
+        '''
+        Gets the bounds of the words ending with a suffix.
+
+        Args:
+            suffix (`str`): Non-empty string the words should end with
+
+        Returns:
+            A tuple (lo, hi) such that the sorted reversed words in [lo, hi)
+            are exactly the reversals of the words ending with suffix
+        '''
+
+        return self.__get_range(self.__get_reversed(), suffix[::-1])
+
+    def get_words_with_suffix(self, suffix):
+        '''
+        Gets the words ending with a suffix in O(log n + k).
+
+        Args:
+            suffix (`str`): Non-empty string the words should end with
+
+        Returns:
+            A list of the words ending with suffix
+        '''
+
+        lo, hi = self.get_suffix_range(suffix)
+        return [w[::-1] for w in self.__get_reversed()[lo:hi]]
+
+    def get_words_within(self, text, length=None):
+        '''
+        Gets the words occurring as substrings of a text.
+
+        From each start position the prefix range of the sorted words is
+        narrowed one character at a time, like a walk down a trie, and the
+        walk stops as soon as no word starts with what was read. The cost
+        follows the text length times the longest partial match rather than
+        the square of the text length.
+
+        Args:
+            text (`str`): Text to search
+            length (`int`): Exact length of the words, or None for any
+
+        Returns:
+            A generator over the words in order of their first occurrence's
+            start, then length. Words occurring more than once repeat
+        '''
+
+        words = self.__get_sorted()
+
+        for i in range(len(text)):
+            lo, hi = 0, len(words)
+            end = len(text) if length is None else min(len(text), i + length)
+
+            for j in range(i + 1, end + 1):
+                prefix = text[i:j]
+                lo, hi = self.__narrow(words, prefix, lo, hi)
+                if lo == hi:
+                    break
+
+                if words[lo] == prefix and (length is None or j - i == length):
+                    yield prefix
+
+    def get_position_count(self, position, letter):
+        '''
+        Gets how many words have a letter at a position.
+
+        Args:
+            position (`int`): 1-based position in the word
+            letter (`str`): Letter expected at that position
+
+        Returns:
+            The size of the posting for (position, letter)
+        '''
+
+        return len(self.__get_positions().get((position, letter), []))
+
+    def get_words_at_positions(self, contains_at):
+        '''
+        Gets the words with given letters at given positions.
+
+        The word table is numbered once, and every (position, letter) pair
+        keeps a sorted array of the ids of the words having it. A query
+        intersects the postings of its pairs, smallest first.
+
+        Args:
+            contains_at (`dict`): Maps 1-based positions to letters
+
+        Returns:
+            A list of the words matching every (position, letter) pair
+        '''
+
+        positions = self.__get_positions()
+
+        return self.__intersect(positions.get(key, []) for key in contains_at.items())
+
+    def get_substring_count(self, substring):
+        '''
+        Gets an upper bound on how many words contain a substring.
+
+        Args:
+            substring (`str`): Non-empty string the words should contain
+
+        Returns:
+            The size of the smallest posting among the substring's n-grams
+        '''
+
+        return min(len(p) for p in self.__get_substring_postings(substring))
+
+    def get_substring_candidates(self, substrings):
+        '''
+        Gets the words that may contain every one of some substrings.
+
+        Every word's 1, 2 and 3 letter grams are kept in an inverted index.
+        A substring is looked up through its longest grams (trigrams for
+        three letters or more) and the postings of all of them are
+        intersected. The result is a superset: a word holding all the
+        trigrams of a longer substring need not hold the substring itself,
+        so callers must verify each candidate.
+
+        Args:
+            substrings (`list`): Non-empty strings the words should contain
+
+        Returns:
+            A list of candidate words
+        '''
+
+        postings = []
+        for substring in substrings:
+            postings.extend(self.__get_substring_postings(substring))
+
+        return self.__intersect(postings)
+
+    def get_words_of_length(self, length):
+        '''
+        Gets the words of an exact length.
+
+        Args:
+            length (`int`): Length of the words
+
+        Returns:
+            A list of the words with that length. Callers must not modify it.
+        '''
+
+        if self.__store is not None:
+            return self.__store.get_words_of_length(length)
+
+        return self.__get_by_length().get(length, [])
+
+
+__all__ = ['WordIndex']
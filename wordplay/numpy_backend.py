@@ -0,0 +1,413 @@
+import numpy as np
+from .criteria import SIZE_IS, BEGINS_WITH, ENDS_WITH, CONTAINS, CONTAINS_AT
+
+
+class NumpyBackend(object):
+    '''
+    Class answering `Dictionary` queries with whole-array NumPy masks.
+
+    The word list is stored as a fixed-width matrix of character codes, a
+    length vector, and a letter-count matrix of the lowercased words with
+    one column per character of the list's alphabet. A query is a handful
+    of vectorized comparisons over those arrays instead of a Python loop
+    over the words, and returns the same words as the index backend.
+
+    Words are added and removed in place. Rows for new words are appended
+    to arrays with spare capacity, and removed words only clear their bit
+    in a mask of live rows that every query starts from; the dead rows are
+    compacted away once they make up a quarter of the arrays.
+
+    Requires the optional `numpy` dependency.
+    '''
+
+    def __init__(self, word_list):
+        words = list(word_list)
+        lower = [w.lower() for w in words]
+
+        points = self.__get_code_points(words)
+        lower_points = self.__get_code_points(lower)
+
+        # Code 0 is padding: code points are mapped to their rank in the
+        # alphabet, and the padding code point 0 always ranks first. Letters
+        # that only come with added words get the next free codes.
+        alphabet = np.union1d(np.unique(points), np.unique(lower_points))
+        alphabet = np.union1d(alphabet, [0])
+        dtype = np.uint8 if len(alphabet) <= 256 else np.uint32
+
+        self.__alphabet = [chr(c) for c in alphabet]
+        self.__codes = dict((c, i) for i, c in enumerate(self.__alphabet))
+
+        lower_chars = np.searchsorted(alphabet, lower_points)
+        counts = np.zeros((len(words), len(alphabet)), dtype=np.uint8)
+        for code in range(1, len(alphabet)):
+            counts[:, code] = (lower_chars == code).sum(axis=1)
+
+        self.__words = words
+        self.__lower = lower
+        self.__rows = None
+        self.__dead = 0
+        self.__set_buffers(
+            np.searchsorted(alphabet, points).astype(dtype),
+            np.array([len(w) for w in words], dtype=np.int64),
+            np.array([len(w) for w in lower], dtype=np.int64),
+            counts,
+            np.ones(len(words), dtype=bool))
+
+    def __set_buffers(self, chars, lengths, lower_lengths, counts, live):
+        # Rows past len(self.__words) are spare capacity, so the arrays the
+        # queries use are views of the rows in use.
+        self.__buffers = [chars, lengths, lower_lengths, counts, live]
+        self.__set_views()
+
+    def __set_views(self):
+        n = len(self.__words)
+        chars, lengths, lower_lengths, counts, live = self.__buffers
+
+        self.__chars = chars[:n]
+        self.__lengths = lengths[:n]
+        self.__lower_lengths = lower_lengths[:n]
+        self.__counts = counts[:n]
+        self.__live = live[:n]
+
+    def __reserve(self, rows, width, codes):
+        # Grows the buffers to hold the rows, characters and alphabet codes
+        # needed, doubling the rows so that appending is amortized.
+        chars, lengths, lower_lengths, counts, live = self.__buffers
+        capacity = len(live)
+
+        if rows <= capacity and width <= chars.shape[1] and codes <= counts.shape[1]:
+            return
+
+        if rows > capacity:
+            capacity = max(rows, 2 * capacity)
+
+        dtype = chars.dtype if codes <= 256 else np.uint32
+
+        def grow(array, shape, dtype):
+            grown = np.zeros(shape, dtype=dtype)
+            grown[tuple(slice(0, d) for d in array.shape)] = array
+            return grown
+
+        self.__set_buffers(
+            grow(chars, (capacity, max(width, chars.shape[1])), dtype),
+            grow(lengths, (capacity,), lengths.dtype),
+            grow(lower_lengths, (capacity,), lower_lengths.dtype),
+            grow(counts, (capacity, max(codes, counts.shape[1])), counts.dtype),
+            grow(live, (capacity,), live.dtype))
+
+    def __get_rows(self):
+        if self.__rows is None:
+            self.__rows = dict(
+                (self.__words[i], i) for i in np.flatnonzero(self.__live))
+
+        return self.__rows
+
+    def __compact(self):
+        keep = np.flatnonzero(self.__live)
+
+        self.__words = [self.__words[i] for i in keep]
+        self.__lower = [self.__lower[i] for i in keep]
+        self.__rows = None
+        self.__dead = 0
+        self.__set_buffers(
+            self.__chars[keep],
+            self.__lengths[keep],
+            self.__lower_lengths[keep],
+            self.__counts[keep],
+            self.__live[keep])
+
+    def add_words(self, words):
+        '''
+        Appends rows for words not in the word list.
+
+        Args:
+            words (`list`): The str words to add
+        '''
+
+        lower = [w.lower() for w in words]
+        for w in words + lower:
+            for c in w:
+                if c not in self.__codes:
+                    self.__codes[c] = len(self.__alphabet)
+                    self.__alphabet.append(c)
+
+        start = len(self.__words)
+        width = max([len(w) for w in words] + [0])
+        self.__reserve(start + len(words), width, len(self.__alphabet))
+
+        chars, lengths, lower_lengths, counts, live = self.__buffers
+        codes = self.__codes
+        for i, (word, low) in enumerate(zip(words, lower), start):
+            chars[i, :len(word)] = [codes[c] for c in word]
+            lengths[i] = len(word)
+            lower_lengths[i] = len(low)
+            for c in low:
+                counts[i, codes[c]] += 1
+            live[i] = True
+
+            if self.__rows is not None:
+                self.__rows[word] = i
+
+        self.__words.extend(words)
+        self.__lower.extend(lower)
+        self.__set_views()
+
+    def remove_words(self, words):
+        '''
+        Masks out the rows of words in the word list.
+
+        Args:
+            words (`list`): The str words to remove
+        '''
+
+        rows = self.__get_rows()
+        for w in words:
+            row = rows.pop(w, None)
+            if row is not None:
+                self.__live[row] = False
+                self.__dead += 1
+
+        if self.__dead * 4 > len(self.__words):
+            self.__compact()
+
+    def __get_code_points(self, words):
+        width = max([len(w) for w in words] + [1])
+        fixed = np.array(words, dtype='U%d' % width).reshape(-1)
+
+        return fixed.view(np.uint32).reshape(len(words), width)
+
+    def __get_code(self, c):
+        return self.__codes.get(c)
+
+    def __get_rack_counts(self, letters):
+        rack = np.zeros(len(self.__alphabet), dtype=np.int64)
+        for c in letters:
+            code = self.__get_code(c)
+            if code is not None:
+                rack[code] += 1
+
+        return rack
+
+    def __get_mask(self, masks, key):
+        # Masks are keyed by the constraint they test, so the queries of a
+        # batch compute each one they have in common only once.
+        if key not in masks:
+            masks[key] = self.__build_mask(key)
+
+        return masks[key]
+
+    def __build_mask(self, key):
+        n, width = self.__chars.shape
+
+        if key[0] == SIZE_IS:
+            return self.__lengths == key[1]
+        elif key[0] == CONTAINS:
+            return self.__match_substring(np.arange(n), key[1])
+
+        # A letter at a column from the start, or k columns from the end
+        kind, k, c = key
+        code = self.__get_code(c)
+        if code is None:
+            return np.zeros(n, dtype=bool)
+        elif kind == ENDS_WITH:
+            cols = np.clip(self.__lengths - k, 0, width - 1)
+            return (self.__lengths >= k) & (self.__chars[np.arange(n), cols] == code)
+
+        return self.__chars[:, k] == code
+
+    def __match_substring(self, rows, substring):
+        chars = self.__chars[rows]
+        width = chars.shape[1]
+        codes = [self.__get_code(c) for c in substring]
+        hit = np.zeros(len(rows), dtype=bool)
+
+        if None in codes:
+            return hit
+
+        for j in range(width - len(codes) + 1):
+            at = np.ones(len(rows), dtype=bool)
+            for t, code in enumerate(codes):
+                at &= chars[:, j + t] == code
+            hit |= at
+
+        return hit
+
+    def __find_words(self, criteria, masks, shared):
+        constraints = criteria.get_constraints()
+        width = self.__chars.shape[1]
+        keys = []
+
+        if SIZE_IS in constraints:
+            keys.append((SIZE_IS, criteria.get_size()))
+
+        if BEGINS_WITH in constraints:
+            begins = criteria.get_begins_with()
+            if len(begins) > width:
+                return []
+            keys.extend((CONTAINS_AT, i, c) for i, c in enumerate(begins))
+
+        if ENDS_WITH in constraints:
+            ends = criteria.get_ends_with()
+            keys.extend((ENDS_WITH, len(ends) - i, c) for i, c in enumerate(ends))
+
+        if CONTAINS_AT in constraints:
+            for k, v in criteria.get_contains_at().items():
+                if k > width:
+                    return []
+                keys.append((CONTAINS_AT, k - 1, v))
+
+        if CONTAINS in constraints:
+            contains = criteria.get_contains()
+            keys.extend((CONTAINS, c) for c in set(contains) if c in shared)
+
+        mask = self.__live.copy()
+        for key in keys:
+            mask &= self.__get_mask(masks, key)
+
+        rows = np.flatnonzero(mask)
+
+        if CONTAINS in constraints:
+            # Substrings no other query needs are only matched on the rows
+            # left, rather than over the whole array.
+            for c in set(contains) - shared:
+                if len(c) != 0 and len(rows) != 0:
+                    rows = rows[self.__match_substring(rows, c)]
+
+            result = [self.__words[i] for i in rows]
+
+            # The mask only proves one occurrence of each substring, so
+            # repeated substrings are counted exactly on what is left.
+            if len(set(contains)) != len(contains):
+                matches = criteria.get_matcher([CONTAINS])
+                result = [w for w in result if matches(w)]
+
+            return result
+
+        return [self.__words[i] for i in rows]
+
+    def get_words(self, criteria):
+        '''
+        Gets the words matching a compiled query.
+
+        Args:
+            criteria (`CompiledCriteria`): Compiled search parameters
+
+        Returns:
+            A list of the words matching the criteria
+        '''
+
+        return self.__find_words(criteria, {}, set())
+
+    def get_words_many(self, criterias):
+        '''
+        Gets the words matching each of a batch of compiled queries.
+
+        The batch shares its masks: each size, letter at a position and
+        substring used by more than one query is compared against the
+        whole array once, and the result is combined into every query
+        using it. Identical queries are answered once.
+
+        Args:
+            criterias (`list`): `CompiledCriteria` objects
+
+        Returns:
+            A list holding, for each criteria in order, the list of words
+            matching it
+        '''
+
+        distinct = set(criterias)
+
+        uses = {}
+        for criteria in distinct:
+            if CONTAINS in criteria.get_constraints():
+                for c in set(criteria.get_contains()):
+                    uses[c] = uses.get(c, 0) + 1
+
+        shared = set(c for c, n in uses.items() if n > 1 and len(c) != 0)
+        masks = {}
+        results = {}
+        for criteria in distinct:
+            results[criteria] = self.__find_words(criteria, masks, shared)
+
+        return [list(results[criteria]) for criteria in criterias]
+
+    def get_rack_words(self, letters, length=None):
+        '''
+        Gets the lowercased words that can be formed from a rack of letters.
+
+        Args:
+            letters (`str`): Rack of letters
+            length (`int`): Exact length of the words, or None for any
+
+        Returns:
+            A list of the lowercased words
+        '''
+
+        rack = self.__get_rack_counts(letters)
+
+        if length is None:
+            rows = self.__live & (self.__lower_lengths <= len(letters))
+        else:
+            rows = self.__live & (self.__lower_lengths == length)
+
+        rows = np.flatnonzero(rows)
+
+        rows = rows[(self.__counts[rows] <= rack).all(axis=1)]
+
+        return [self.__lower[i] for i in rows]
+
+    def get_blank_rack_words(self, letters, blanks, length=None):
+        '''
+        Gets the words that can be formed from a rack holding blank tiles.
+
+        Args:
+            letters (`str`): Rack of letters, without the blanks
+            blanks (`int`): Number of blank tiles that match any letter
+            length (`int`): Exact length of the words, or None for any
+
+        Returns:
+            A list of (word, used) tuples, where used holds the letters the
+            blanks stood for in sorted order
+        '''
+
+        rack = self.__get_rack_counts(letters)
+
+        if length is None:
+            rows = self.__live & (self.__lower_lengths <= len(letters) + blanks)
+        else:
+            rows = self.__live & (self.__lower_lengths == length)
+
+        rows = np.flatnonzero(rows)
+
+        deficits = np.maximum(self.__counts[rows].astype(np.int64) - rack, 0)
+        keep = deficits.sum(axis=1) <= blanks
+        alphabet = self.__alphabet
+
+        result = []
+        for i, deficit in zip(rows[keep], deficits[keep]):
+            # Codes of letters added later are out of character order
+            used = ''.join(sorted(
+                alphabet[j] * deficit[j] for j in np.flatnonzero(deficit)))
+            result.append((self.__lower[i], used))
+
+        return result
+
+    def get_anagrams(self, letters):
+        '''
+        Gets the lowercased words made of exactly the given letters.
+
+        Args:
+            letters (`str`): Letters the words should be made of
+
+        Returns:
+            A list of the lowercased words
+        '''
+
+        rack = self.__get_rack_counts(letters)
+        rows = np.flatnonzero(self.__live & (self.__lower_lengths == len(letters)))
+        rows = rows[(self.__counts[rows] == rack).all(axis=1)]
+
+        return [self.__lower[i] for i in rows]
+
+
+__all__ = ['NumpyBackend']
@@ -0,0 +1,96 @@
+import multiprocessing
+
+# The Dictionary over this worker process' shard of the word list
+_shard = None
+
+
+def _load_shard(words, backend):
+    global _shard
+    from .dictionary import Dictionary
+
+    _shard = Dictionary(set(words), backend)
+
+
+def _call_shard(method, args, kwargs):
+    return getattr(_shard, method)(*args, **kwargs)
+
+
+class ShardPool(object):
+    '''
+    Class running `Dictionary` queries over shards of a word list in
+    parallel worker processes.
+
+    The word list is split into one shard per worker, and each worker is a
+    single-process `multiprocessing.Pool` that receives its shard once, when
+    it starts, and keeps it, so queries only ship their arguments and
+    results. Workers build their own indexes lazily, like any `Dictionary`.
+    '''
+
+    def __init__(self, word_list, workers=None, backend=None):
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+
+        words = list(word_list)
+        self.__pools = []
+
+        # The pools' processes start, and load their shard, right away, so
+        # shards are shipped up front rather than by the first query.
+        for i in range(workers):
+            self.__pools.append(multiprocessing.Pool(
+                1, _load_shard, (words[i::workers], backend)))
+
+    def get_workers(self):
+        return len(self.__pools)
+
+    def map(self, method, *args, **kwargs):
+        '''
+        Calls a `Dictionary` method on every shard.
+
+        Args:
+            method (`str`): Name of the method
+            *args: Positional arguments of the method
+            **kwargs: Keyword arguments of the method
+
+        Returns:
+            A list of the result from each shard
+        '''
+
+        results = [
+            pool.apply_async(_call_shard, (method, args, kwargs))
+            for pool in self.__pools]
+
+        return [result.get() for result in results]
+
+    def scatter(self, method, items):
+        '''
+        Calls a `Dictionary` method on every shard with its share of items.
+
+        Items are dealt out the same way the word list was split, so
+        adding words this way keeps the shards balanced.
+
+        Args:
+            method (`str`): Name of the method
+            items (`list`): Items to deal out; shard i gets items[i::n]
+
+        Returns:
+            A list of the result from each shard
+        '''
+
+        n = len(self.__pools)
+        results = [
+            pool.apply_async(_call_shard, (method, (items[i::n],), {}))
+            for i, pool in enumerate(self.__pools)]
+
+        return [result.get() for result in results]
+
+    def shutdown(self):
+        '''Stop the worker processes.'''
+
+        for pool in self.__pools:
+            pool.close()
+            pool.join()
+
+        self.__pools = []
+
+
+__all__ = ['ShardPool']
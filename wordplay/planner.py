@@ -0,0 +1,254 @@
+from .criteria import SIZE_IS, BEGINS_WITH, ENDS_WITH, CONTAINS, CONTAINS_AT
+
+SCAN = 'scan'
+
+# A candidate range this small is cheaper to filter than building a posting
+# index to narrow it further.
+SMALL_RANGE = 1024
+
+
+class QueryPlan(object):
+    '''
+    Class describing how a `Dictionary` answers a `Criteria`.
+
+    Attributes:
+
+    access_path - Constraint driving the search, or 'scan' for a full scan
+
+    estimated - Candidate count the planner expected from the access path
+
+    estimates - Dict of the estimate of every access path it considered
+
+    residual - List of the constraints still checked on every candidate
+
+    actual - Candidates actually read, or None if the plan was not run
+
+    matches - Words actually returned, or None if the plan was not run
+    '''
+
+    def __init__(self, access_path, estimates, residual):
+        self.access_path = access_path
+        self.estimated = estimates[access_path]
+        self.estimates = estimates
+        self.residual = residual
+        self.actual = None
+        self.matches = None
+
+    def __repr__(self):
+        return (
+            'QueryPlan(access_path={!r}, estimated={!r}, actual={!r}, '
+            'matches={!r}, residual={!r})'.format(
+                self.access_path,
+                self.estimated,
+                self.actual,
+                self.matches,
+                self.residual))
+
+
+class QueryPlanner(object):
+    '''
+    Class choosing the most selective access path for a `CompiledCriteria`.
+
+    Every constraint that has an index is given a candidate count from that
+    index: the size of a length bucket, of a prefix or suffix range, of the
+    smallest positional posting, or of the smallest n-gram posting. The
+    search starts from the smallest one, and the other constraints are
+    checked on each candidate as residual filters. Posting indexes cost
+    seconds to build, so they are only consulted when the cheap ranges leave
+    more than `SMALL_RANGE` candidates.
+    '''
+
+    def __init__(self, word_list, index):
+        self.__word_list = word_list
+        self.__index = index
+
+    def __get_substrings(self, criteria):
+        return [c for c in criteria.get_contains() if len(c) != 0]
+
+    def __get_estimates(self, criteria, postings=True):
+        index = self.__index
+        size = criteria.get_size()
+        begins = criteria.get_begins_with()
+        ends = criteria.get_ends_with()
+        o_contains = criteria.get_contains_at()
+        substrings = self.__get_substrings(criteria)
+
+        estimates = {SCAN: len(self.__word_list)}
+
+        if size is not None:
+            estimates[SIZE_IS] = len(index.get_words_of_length(size))
+        if len(begins) != 0:
+            lo, hi = index.get_prefix_range(begins)
+            estimates[BEGINS_WITH] = hi - lo
+        if len(ends) != 0:
+            lo, hi = index.get_suffix_range(ends)
+            estimates[ENDS_WITH] = hi - lo
+
+        if not postings or min(estimates.values()) <= SMALL_RANGE:
+            return estimates
+
+        if len(o_contains) != 0:
+            estimates[CONTAINS_AT] = min(
+                index.get_position_count(k, v) for k, v in o_contains.items())
+        if len(substrings) != 0:
+            estimates[CONTAINS] = min(
+                index.get_substring_count(c) for c in substrings)
+
+        return estimates
+
+    def __get_residual(self, criteria, access_path):
+        residual = criteria.get_constraints()
+
+        # n-gram candidates are a superset, so contains is always verified
+        if access_path != CONTAINS and access_path in residual:
+            residual.remove(access_path)
+
+        return residual
+
+    def __get_access_key(self, criteria, access_path):
+        if access_path == SIZE_IS:
+            return access_path, criteria.get_size()
+        elif access_path == BEGINS_WITH:
+            return access_path, criteria.get_begins_with()
+        elif access_path == ENDS_WITH:
+            return access_path, criteria.get_ends_with()
+        elif access_path == CONTAINS_AT:
+            return access_path, tuple(sorted(criteria.get_contains_at().items()))
+        elif access_path == CONTAINS:
+            return access_path, tuple(self.__get_substrings(criteria))
+
+        return access_path, None
+
+    def __get_candidates(self, criteria, access_path):
+        index = self.__index
+
+        if access_path == SIZE_IS:
+            return index.get_words_of_length(criteria.get_size())
+        elif access_path == BEGINS_WITH:
+            return index.get_words_with_prefix(criteria.get_begins_with())
+        elif access_path == ENDS_WITH:
+            return index.get_words_with_suffix(criteria.get_ends_with())
+        elif access_path == CONTAINS_AT:
+            return index.get_words_at_positions(criteria.get_contains_at())
+        elif access_path == CONTAINS:
+            return index.get_substring_candidates(self.__get_substrings(criteria))
+
+        return self.__word_list
+
+    def plan(self, criteria, postings=True):
+        '''
+        Chooses how to answer a query without running it.
+
+        Args:
+            criteria (`CompiledCriteria`): Compiled search parameters
+            postings (`bool`): Whether the posting indexes may be consulted
+
+        Returns:
+            A `QueryPlan`
+        '''
+
+        estimates = self.__get_estimates(criteria, postings)
+        access_path = min(estimates, key=lambda path: (estimates[path], path))
+
+        return QueryPlan(
+            access_path,
+            estimates,
+            self.__get_residual(criteria, access_path))
+
+    def execute(self, criteria, plan=None):
+        '''
+        Runs a query.
+
+        Args:
+            criteria (`CompiledCriteria`): Compiled search parameters
+            plan (`QueryPlan`): Plan to run, or None to plan the query first.
+                Its actual and matches counts are filled in
+
+        Returns:
+            A list of the words matching the criteria
+        '''
+
+        if plan is None:
+            plan = self.plan(criteria)
+
+        candidates = self.__get_candidates(criteria, plan.access_path)
+
+        if len(plan.residual) == 0:
+            result = list(candidates)
+        else:
+            matches = criteria.get_matcher(plan.residual)
+            result = [w for w in candidates if matches(w)]
+
+        plan.actual = len(candidates)
+        plan.matches = len(result)
+
+        return result
+
+    def iterate(self, criteria, limit=None):
+        '''
+        Runs a query lazily.
+
+        Candidates are read from the chosen access path and filtered one at
+        a time, so a caller that stops early skips the rest of the filtering.
+        A limited query leaves the posting indexes out of its plan, since a
+        scan usually finds a few matches long before they could be built.
+
+        Args:
+            criteria (`CompiledCriteria`): Compiled search parameters
+            limit (`int`): Number of matches the caller needs, or None
+
+        Returns:
+            An iterator over the words matching the criteria
+        '''
+
+        plan = self.plan(criteria, limit is None)
+        candidates = self.__get_candidates(criteria, plan.access_path)
+
+        if len(plan.residual) == 0:
+            return iter(candidates)
+
+        matches = criteria.get_matcher(plan.residual)
+        return (w for w in candidates if matches(w))
+
+    def execute_many(self, criterias):
+        '''
+        Runs a batch of queries, sharing work between them.
+
+        Identical queries are answered once. Queries driven by the same
+        index range read its candidates once. Queries left with a full scan
+        share a single pass over the word list.
+
+        Args:
+            criterias (`list`): `CompiledCriteria` objects
+
+        Returns:
+            A list holding, for each query in order, the list of the words
+            matching it
+        '''
+
+        # Group the distinct queries by the candidates they start from.
+        groups = {}
+        for criteria in set(criterias):
+            plan = self.plan(criteria)
+            access_key = self.__get_access_key(criteria, plan.access_path)
+            groups.setdefault(access_key, []).append((criteria, plan))
+
+        results = {}
+        for (access_path, _), queries in groups.items():
+            candidates = self.__get_candidates(queries[0][0], access_path)
+            matchers = []
+            for criteria, plan in queries:
+                results[criteria] = []
+                matchers.append((
+                    results[criteria].append,
+                    criteria.get_matcher(plan.residual)))
+
+            for w in candidates:
+                for append, matches in matchers:
+                    if matches(w):
+                        append(w)
+
+        return [list(results[criteria]) for criteria in criterias]
+
+
+__all__ = ['QueryPlan', 'QueryPlanner']
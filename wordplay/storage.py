@@ -0,0 +1,448 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from .utils import ArgumentError, ErrorMessage
+
+MAGIC = b'WORDPLAY'
+VERSION = 1
+
+# magic, version, word count, blob size in bytes, length bucket count
+HEADER = struct.Struct('<8sIIII')
+NUMBER = struct.Struct('<I')
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def get_data_path(name):
+    '''
+    Gets the path of a file bundled in the package's data directory.
+
+    Args:
+        name (`str`): File name, e.g. 'scrabble_wordlist.idx'
+
+    Returns:
+        The absolute path of the file
+    '''
+
+    return os.path.join(DATA_DIR, name)
+
+
+def _get_signature(word):
+    return ''.join(sorted(word.lower()))
+
+
+def _encode(word):
+    # Words are already UTF-8 encoded str on Python 2
+    return word if isinstance(word, bytes) else word.encode('utf-8')
+
+
+def _decode(data):
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+
+    return data if str is bytes else data.decode('utf-8')
+
+
+def _to_blob(data, start, size):
+    try:
+        return memoryview(data)[start:start + size]
+    except TypeError:
+        # Python 2 cannot take a memoryview of an mmap
+        return _Section(data, start, size)
+
+
+def _to_array(data, start, size):
+    # Index files are little-endian. Where that matches the machine the
+    # numbers are viewed in place; elsewhere, and on Python 2, which lacks
+    # memoryview.cast, each is unpacked from the buffer as it is read.
+    if sys.byteorder == 'little' and array('I').itemsize == 4:
+        try:
+            return memoryview(data)[start:start + size].cast('I')
+        except (TypeError, AttributeError):
+            pass
+
+    return _Numbers(data, start, size // NUMBER.size)
+
+
+def _pack_words(words):
+    encoded = [_encode(w) for w in words]
+
+    offsets = array('I', [0])
+    for e in encoded:
+        offsets.append(offsets[-1] + len(e))
+
+    return b''.join(encoded), offsets
+
+
+def _get_length_ids(words):
+    # The sort is stable, so each length keeps its words in sorted order.
+    ids = array('I', sorted(range(len(words)), key=lambda i: len(words[i])))
+
+    length_table = array('I')
+    for start, i in enumerate(ids):
+        if start == 0 or len(words[i]) != len(words[ids[start - 1]]):
+            length_table.extend([len(words[i]), start, 0])
+        length_table[-1] += 1
+
+    return length_table, ids
+
+
+def _get_signature_ids(words):
+    return array('I', sorted(
+        range(len(words)), key=lambda i: _get_signature(words[i])))
+
+
+def _get_reversal(word):
+    return word[::-1]
+
+
+def _get_reversed_ids(words):
+    return array('I', sorted(
+        range(len(words)), key=lambda i: _get_reversal(words[i])))
+
+
+class _Section(object):
+    '''Bytes in part of a buffer, read out on slicing.'''
+
+    def __init__(self, data, start, size):
+        self.__data = data
+        self.__start = start
+        self.__size = size
+
+    def __len__(self):
+        return self.__size
+
+    def __getitem__(self, i):
+        lo, hi, _ = i.indices(self.__size)
+        return self.__data[self.__start + lo:self.__start + hi]
+
+
+class _Numbers(object):
+    '''Sequence of the little-endian uint32 numbers in part of a buffer.'''
+
+    def __init__(self, data, start, count):
+        self.__data = data
+        self.__start = start
+        self.__count = count
+
+    def __len__(self):
+        return self.__count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.__count))]
+
+        if i < 0:
+            i += self.__count
+        if not 0 <= i < self.__count:
+            raise IndexError('number index out of range')
+
+        return NUMBER.unpack_from(self.__data, self.__start + NUMBER.size * i)[0]
+
+
+class _KeyView(object):
+    '''Sequence of a key of the words of a word list, in sorted order.'''
+
+    def __init__(self, words, ids, key):
+        self.__words = words
+        self.__ids = ids
+        self.__key = key
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        return self.__key(self.__words.get_word(self.__ids[i]))
+
+
+class SortedWordList(object):
+    '''
+    Class providing a read-only set of words kept as one sorted UTF-8 blob.
+
+    Word i is the bytes of the blob between offsets i and i + 1, so words are
+    stored without per-object overhead and decoded only when read. It keeps
+    two more id arrays: the ids grouped by length, with a table of where
+    each length starts, and the ids ordered by anagram signature.
+    Membership and prefix lookups are binary searches, and the class can be
+    passed anywhere a `Dictionary` takes a set.
+    '''
+
+    def __init__(
+            self,
+            blob,
+            offsets,
+            length_table=None,
+            length_ids=None,
+            signature_ids=None):
+        self.__blob = blob
+        self.__offsets = offsets
+        self.__length_ids = length_ids
+        self.__signature_ids = signature_ids
+        self.__reversed_ids = None
+        self.__lengths = None
+        self.__alphabet = None
+
+        if length_table is not None:
+            self.__set_lengths(length_table)
+
+    def __set_lengths(self, length_table):
+        self.__lengths = {}
+        for i in range(0, len(length_table), 3):
+            length, start, count = length_table[i:i + 3]
+            self.__lengths[length] = (start, count)
+
+    def __get_length_ids(self):
+        # Arrays not given up front are built from the words on first use.
+        if self.__lengths is None:
+            length_table, self.__length_ids = _get_length_ids(self)
+            self.__set_lengths(length_table)
+
+        return self.__length_ids
+
+    def __get_signature_ids(self):
+        if self.__signature_ids is None:
+            self.__signature_ids = _get_signature_ids(self)
+
+        return self.__signature_ids
+
+    def __get_reversed_ids(self):
+        if self.__reversed_ids is None:
+            self.__reversed_ids = _get_reversed_ids(self)
+
+        return self.__reversed_ids
+
+    def __len__(self):
+        return len(self.__offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.get_word(j) for j in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('word index out of range')
+
+        return self.get_word(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_word(i)
+
+    def __contains__(self, word):
+        if not isinstance(word, str):
+            return False
+
+        i = bisect_left(self, word)
+        return i < len(self) and self.get_word(i) == word
+
+    def get_word(self, i):
+        '''
+        Gets the word at a position in sorted order, without bounds checks.
+
+        Args:
+            i (`int`): Position in [0, len(self))
+
+        Returns:
+            The word as a str
+        '''
+
+        offsets = self.__offsets
+        return _decode(self.__blob[offsets[i]:offsets[i + 1]])
+
+    def get_signatures(self):
+        '''
+        Gets the anagram signatures of the lowercased words.
+
+        Returns:
+            A sorted sequence that signatures are decoded from on access
+        '''
+
+        return _KeyView(self, self.__get_signature_ids(), _get_signature)
+
+    def get_reversed_words(self):
+        '''
+        Gets the reversals of the words, for suffix lookups.
+
+        Only an array of ids in reversed-word order is built and kept; the
+        reversals are decoded from the blob on access.
+
+        Returns:
+            A sorted sequence of the reversed words, which can be sliced
+        '''
+
+        return _KeyView(self, self.__get_reversed_ids(), _get_reversal)
+
+    def get_words_with_signature(self, signature):
+        '''
+        Gets the lowercased words having an anagram signature.
+
+        Args:
+            signature (`str`): Letters in sorted order
+
+        Returns:
+            A list of the lowercased words
+        '''
+
+        ids = self.__get_signature_ids()
+        lo = bisect_left(_KeyView(self, ids, _get_signature), signature)
+
+        result = []
+        for i in range(lo, len(self)):
+            word = self.get_word(ids[i]).lower()
+            if _get_signature(word) != signature:
+                break
+            result.append(word)
+
+        return result
+
+    def get_words_of_length(self, length):
+        '''
+        Gets the words of an exact length.
+
+        Args:
+            length (`int`): Length of the words
+
+        Returns:
+            A sorted list of the words with that length
+        '''
+
+        ids = self.__get_length_ids()
+        start, count = self.__lengths.get(length, (0, 0))
+
+        return [self.get_word(ids[i]) for i in range(start, start + count)]
+
+    def get_alphabet(self):
+        '''
+        Gets the characters of the lowercased words.
+
+        Returns:
+            A set of single-character strings
+        '''
+
+        if self.__alphabet is None:
+            self.__alphabet = set(_decode(self.__blob[:]).lower())
+
+        return self.__alphabet
+
+
+class CompactWordList(SortedWordList):
+    '''
+    Class providing a `SortedWordList` held in memory.
+
+    A set of str pays for a hash table slot and a full str object per word.
+    This keeps the words as one bytes blob and an `array('I')` of offsets,
+    a few bytes of overhead per word, at the cost of decoding words as they
+    are read and of binary rather than hash membership tests. The length
+    and signature arrays are built the first time a query needs them.
+
+    Args:
+        words (iterable): The str words; duplicates are dropped
+    '''
+
+    def __init__(self, words):
+        SortedWordList.__init__(self, *_pack_words(sorted(set(words))))
+
+
+class MappedWordList(SortedWordList):
+    '''
+    Class providing a `SortedWordList` memory-mapped from an index file.
+
+    Opening a file only reads its header: the blob and the id arrays are
+    viewed in place in the mapping, so loading takes no parse time, pages
+    are read from disk as queries touch them, and processes mapping the
+    same file share its pages. Files are written by `build_index`.
+
+    Raises:
+        `ArgumentError`: If the file is not a valid index file
+    '''
+
+    def __init__(self, path):
+        try:
+            with open(path, 'rb') as f:
+                self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            raise ArgumentError(ErrorMessage.INVALID_IDX)
+
+        self.__path = path
+
+        if len(self.__map) < HEADER.size:
+            raise ArgumentError(ErrorMessage.INVALID_IDX)
+
+        magic, version, count, blob_size, lengths = HEADER.unpack_from(self.__map)
+        if magic != MAGIC or version != VERSION:
+            raise ArgumentError(ErrorMessage.INVALID_IDX)
+
+        # The sections follow the header in this order; the blob is padded
+        # so that the id arrays are aligned.
+        sizes = [
+            blob_size + (-blob_size % 4),
+            4 * (count + 1),
+            4 * 3 * lengths,
+            4 * count,
+            4 * count]
+
+        if HEADER.size + sum(sizes) != len(self.__map):
+            raise ArgumentError(ErrorMessage.INVALID_IDX)
+
+        starts = [HEADER.size]
+        for size in sizes:
+            starts.append(starts[-1] + size)
+
+        SortedWordList.__init__(
+            self,
+            _to_blob(self.__map, starts[0], blob_size),
+            *[_to_array(self.__map, starts[i], sizes[i]) for i in range(1, 5)])
+
+    def __reduce__(self):
+        # Mappings cannot be pickled, so a copy maps the same file again.
+        return MappedWordList, (self.__path,)
+
+    def get_path(self):
+        return self.__path
+
+
+def build_index(source, path):
+    '''
+    Writes an index file that `MappedWordList` can map.
+
+    Args:
+        source (`str` or iterable): Path of a word list file with
+            whitespace-separated words, like the bundled .dat files, or an
+            iterable of str words
+        path (`str`): Path of the index file to write
+    '''
+
+    if isinstance(source, str):
+        with open(source) as f:
+            source = f.read().split()
+
+    words = sorted(set(source))
+    blob, offsets = _pack_words(words)
+    length_table, length_ids = _get_length_ids(words)
+    signature_ids = _get_signature_ids(words)
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, len(words), len(blob), len(length_table) // 3))
+        f.write(blob + b'\0' * (-len(blob) % 4))
+
+        for numbers in [offsets, length_table, length_ids, signature_ids]:
+            if sys.byteorder != 'little':
+                numbers.byteswap()
+            f.write(numbers.tostring() if str is bytes else numbers.tobytes())
+
+
+__all__ = [
+    'SortedWordList',
+    'CompactWordList',
+    'MappedWordList',
+    'build_index',
+    'get_data_path']
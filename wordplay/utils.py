@@ -153,7 +153,8 @@ class Utils:
         for c in arg:
             if not cls.is_allowed_char(c):
                 return False
-            return True
+
+        return True
 
 
 class ArgumentError(AssertionError):
@@ -175,6 +176,7 @@ class ErrorMessage:
     INVALID_CRTRA = 'Invalid criteria passed'
     NONEXST_RMV = 'Tried to remove nonexistent element'
     LEN_GRTR_WORD = 'Length passed > than length of word'
+    INVALID_IDX = 'Invalid or corrupt index file passed'
 
 
 __all__ = ['Utils', 'ArgumentError', 'CriteriaError', 'ErrorMessage']